@@ -6,7 +6,8 @@ from PowerPoint presentations while preserving instructional design elements.
 """
 
 import re
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -57,6 +58,31 @@ class PPTXExtractor:
         r'^\d+[\.\)]\s+'  # Simple numbered items
     ]
     
+    # Title patterns for short section-divider slides
+    SECTION_PATTERNS = [
+        r'part\s+\d+', r'section\s+\d+', r'chapter\s+\d+',
+        r'introduction', r'getting started', r'overview',
+        r'conclusion', r'summary', r'wrap.?up'
+    ]
+    
+    # Focused, high-quality patterns for learning objectives
+    OBJECTIVE_PATTERNS = [
+        # Explicit objective statements with proper context
+        r'(?:learning\s+objectives?|objectives?|goals?)[:\s]*\n?[•\-\*]?\s*([A-Z][^.\n!?]{15,120})',
+        
+        # "You will" patterns with action verbs
+        r'(?:you|students?|learners?|participants?)\s+(?:will|can|should)\s+(?:be\s+able\s+to\s+)?(learn|understand|identify|demonstrate|explain|configure|implement|analyze|create|evaluate|apply|assess|manage|administer|deploy|troubleshoot|validate|enable)\s+([^.\n!?]{10,100})',
+        
+        # "After this" clear completion patterns
+        r'(?:by\s+the\s+end\s+of\s+this|after\s+completing\s+this|upon\s+completion)[^.\n!?]*?(?:you|students?|learners?)\s+(?:will|should)\s+(?:be\s+able\s+to\s+)?([^.\n!?]{15,100})',
+        
+        # Bullet point objectives with action verbs
+        r'[•\-\*]\s*(?:Be\s+able\s+to\s+|Learn\s+to\s+|Understand\s+how\s+to\s+)?([A-Z][a-z]+\s+(?:GHAS|GitHub|security|policies|features|access|requirements)[^•\-\*\n]{10,80})',
+        
+        # Clear instructional outcomes
+        r'(?:learning\s+outcomes?|outcomes?)[:\s]*[•\-\*]\s*([A-Z][^•\-\*\n]{15,100})'
+    ]
+    
     # Keywords that indicate learning activities (enterprise training focused)
     ACTIVITY_MARKERS = {
         'lab': 'hands-on-lab',
@@ -104,6 +130,20 @@ class PPTXExtractor:
         'gdpr', 'hipaa', 'sox', 'iso', 'nist', 'pci', 'regulation'
     ]
     
+    # Substrings that suggest a text box holds code (matched against lowercased text)
+    CODE_INDICATORS = (
+        '{', '}', '()', '[]', ';', '->', '=>', 
+        'function', 'def ', 'class ', 'import ', 'from ',
+        'SELECT', 'INSERT', 'UPDATE', 'DELETE',
+        '$', '#', '//', '/*', '*/', '<!--', '-->'
+    )
+    
+    # Compiled once at class creation so per-slide helpers never hit the re cache
+    _MODULE_NUMBER_RE = re.compile('|'.join(f'(?:{p})' for p in MODULE_NUMBER_PATTERNS))
+    _SECTION_RE = re.compile('|'.join(SECTION_PATTERNS))
+    _OBJECTIVE_RES = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in OBJECTIVE_PATTERNS]
+    _LEADING_CONJUNCTION_RE = re.compile(r'^(?:and\s+|or\s+)', re.IGNORECASE)
+    
     def __init__(self, pptx_path: str):
         """Initialize extractor with PowerPoint file path."""
         self.pptx_path = Path(pptx_path)
@@ -327,22 +367,24 @@ class PPTXExtractor:
         
         return code_blocks
     
-    def _looks_like_code(self, text: str, shape) -> bool:
-        """Determine if text looks like code using various heuristics."""
-        # Check for common code indicators
-        code_indicators = [
-            '{', '}', '()', '[]', ';', '->', '=>', 
-            'function', 'def ', 'class ', 'import ', 'from ',
-            'SELECT', 'INSERT', 'UPDATE', 'DELETE',
-            '$', '#', '//', '/*', '*/', '<!--', '-->'
-        ]
-        
+    @classmethod
+    def _looks_like_code(cls, text: str, shape) -> bool:
+        """Determine if a shape's text looks like code using various heuristics."""
+        # The heuristics only look at the text, so repeated text hits the cache
+        return cls._looks_like_code_text(text)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def _looks_like_code_text(cls, text: str) -> bool:
+        """Text-only code heuristics (cached; pure function of its args)."""
+        # If multiple indicators present, likely code; stop scanning at the second
         text_lower = text.lower()
-        indicator_count = sum(1 for indicator in code_indicators if indicator in text_lower)
-        
-        # If multiple indicators present, likely code
-        if indicator_count >= 2:
-            return True
+        indicator_count = 0
+        for indicator in cls.CODE_INDICATORS:
+            if indicator in text_lower:
+                indicator_count += 1
+                if indicator_count >= 2:
+                    return True
         
         # Check for indentation patterns (common in code)
         lines = text.split('\n')
@@ -352,8 +394,10 @@ class PPTXExtractor:
         
         return False
     
-    def _detect_language(self, code: str) -> str:
-        """Attempt to detect programming language from code content."""
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _detect_language(code: str) -> str:
+        """Attempt to detect programming language from code content (cached)."""
         code_lower = code.lower()
         
         # Simple language detection based on keywords (order matters - more specific first)
@@ -372,7 +416,8 @@ class PPTXExtractor:
         
         return 'text'  # Default fallback
     
-    def _is_module_start(self, title: Optional[str], content: List[str]) -> bool:
+    @classmethod
+    def _is_module_start(cls, title: Optional[str], content: List[str]) -> bool:
         """Enhanced module detection with fuzzy matching and content analysis."""
         if not title:
             return False
@@ -380,13 +425,12 @@ class PPTXExtractor:
         title_lower = title.lower().strip()
         
         # Check for explicit module markers
-        if any(marker in title_lower for marker in self.MODULE_MARKERS):
+        if any(marker in title_lower for marker in cls.MODULE_MARKERS):
             return True
         
         # Check for numbered patterns
-        for pattern in self.MODULE_NUMBER_PATTERNS:
-            if re.search(pattern, title_lower):
-                return True
+        if cls._MODULE_NUMBER_RE.search(title_lower):
+            return True
         
         # Check content for module indicators
         all_text = ' '.join(content).lower()
@@ -402,41 +446,23 @@ class PPTXExtractor:
         # Special case: if slide has very little content and seems like a section divider
         if len(title_lower.split()) <= 5 and len(all_text) < 100:
             # Check for section-like patterns
-            section_patterns = [
-                r'part\s+\d+', r'section\s+\d+', r'chapter\s+\d+',
-                r'introduction', r'getting started', r'overview',
-                r'conclusion', r'summary', r'wrap.?up'
-            ]
-            if any(re.search(pattern, title_lower) for pattern in section_patterns):
+            if cls._SECTION_RE.search(title_lower):
                 return True
         
         return False
     
     def _extract_learning_objectives(self, content: List[str], speaker_notes: str) -> List[str]:
         """Extract learning objectives with robust, inclusive patterns."""
+        return list(self._objectives_in_text(' '.join(content) + ' ' + speaker_notes))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def _objectives_in_text(cls, all_text: str) -> Tuple[str, ...]:
+        """Learning objectives found in a slide's combined text (cached; pure function of its args)."""
         objectives = []
-        all_text = ' '.join(content) + ' ' + speaker_notes
         
-        # Focused, high-quality patterns for learning objectives
-        objective_patterns = [
-            # Explicit objective statements with proper context
-            r'(?:learning\s+objectives?|objectives?|goals?)[:\s]*\n?[•\-\*]?\s*([A-Z][^.\n!?]{15,120})',
-            
-            # "You will" patterns with action verbs
-            r'(?:you|students?|learners?|participants?)\s+(?:will|can|should)\s+(?:be\s+able\s+to\s+)?(learn|understand|identify|demonstrate|explain|configure|implement|analyze|create|evaluate|apply|assess|manage|administer|deploy|troubleshoot|validate|enable)\s+([^.\n!?]{10,100})',
-            
-            # "After this" clear completion patterns
-            r'(?:by\s+the\s+end\s+of\s+this|after\s+completing\s+this|upon\s+completion)[^.\n!?]*?(?:you|students?|learners?)\s+(?:will|should)\s+(?:be\s+able\s+to\s+)?([^.\n!?]{15,100})',
-            
-            # Bullet point objectives with action verbs
-            r'[•\-\*]\s*(?:Be\s+able\s+to\s+|Learn\s+to\s+|Understand\s+how\s+to\s+)?([A-Z][a-z]+\s+(?:GHAS|GitHub|security|policies|features|access|requirements)[^•\-\*\n]{10,80})',
-            
-            # Clear instructional outcomes
-            r'(?:learning\s+outcomes?|outcomes?)[:\s]*[•\-\*]\s*([A-Z][^•\-\*\n]{15,100})'
-        ]
-        
-        for pattern in objective_patterns:
-            matches = re.finditer(pattern, all_text, re.IGNORECASE | re.MULTILINE)
+        for pattern in cls._OBJECTIVE_RES:
+            matches = pattern.finditer(all_text)
             for match in matches:
                 objective = match.group(1).strip() if match.lastindex else match.group(0).strip()
                 
@@ -446,7 +472,7 @@ class PPTXExtractor:
                     objective.count(' ') >= 1):  # At least 2 words
                     
                     # Clean up common artifacts
-                    objective = re.sub(r'^(?:and\s+|or\s+)', '', objective, flags=re.IGNORECASE)
+                    objective = cls._LEADING_CONJUNCTION_RE.sub('', objective)
                     objective = objective.strip('.,!?')
                     
                     if len(objective) > 5:
@@ -461,9 +487,10 @@ class PPTXExtractor:
                 seen.add(obj_clean)
                 unique_objectives.append(obj)
         
-        return unique_objectives[:8]  # Allow more objectives to be captured
+        return tuple(unique_objectives[:8])  # Allow more objectives to be captured
     
-    def _detect_activity_type(self, title: Optional[str], content: List[str]) -> Optional[str]:
+    @classmethod
+    def _detect_activity_type(cls, title: Optional[str], content: List[str]) -> Optional[str]:
         """Detect the type of learning activity represented by the slide."""
         if not title:
             return None
@@ -472,7 +499,7 @@ class PPTXExtractor:
         all_content = ' '.join(content).lower()
         
         # Check title and content for activity markers
-        for marker, activity_type in self.ACTIVITY_MARKERS.items():
+        for marker, activity_type in cls.ACTIVITY_MARKERS.items():
             if marker in title_lower or marker in all_content:
                 return activity_type
         
@@ -5,8 +5,14 @@ Converts extracted PPTX data into LLM-optimized markdown with intelligent chunki
 that preserves instructional design patterns and maintains narrative flow.
 """
 
+import os
 import re
+import bisect
+import logging
+import functools
+import itertools
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
@@ -16,9 +22,50 @@ try:
 except ImportError:
     TIKTOKEN_AVAILABLE = False
 
+try:
+    from yaml import CSafeDumper as _YamlDumper  # libyaml-backed emitter
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 from extractor import SlideData
 from utils import sanitize_filename
 
+logger = logging.getLogger("pptx_shredder")
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoder(name: str):
+    """Load a tiktoken encoding once per process (cached; BPE setup is costly)."""
+    return tiktoken.get_encoding(name)
+
+
+@functools.lru_cache(maxsize=1024)
+def _module_id(title: str, number: int) -> str:
+    """Generate a URL-friendly module ID (cached; pure function of its args)."""
+    # Clean title and make lowercase
+    clean_title = re.sub(r'[^\w\s-]', '', title.lower())
+    clean_title = re.sub(r'[-\s]+', '-', clean_title).strip('-')
+    
+    # Limit length and add number
+    if len(clean_title) > 30:
+        clean_title = clean_title[:30].rstrip('-')
+    
+    return f"{number:02d}-{clean_title}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_duration(minutes: int) -> str:
+    """Format duration in a human-readable way (cached; pure function of its args)."""
+    if minutes < 60:
+        return f"{minutes} minutes"
+    else:
+        hours = minutes // 60
+        remaining_minutes = minutes % 60
+        if remaining_minutes == 0:
+            return f"{hours} hour{'s' if hours > 1 else ''}"
+        else:
+            return f"{hours} hour{'s' if hours > 1 else ''} {remaining_minutes} minutes"
+
 
 @dataclass
 class ChunkData:
@@ -51,12 +98,16 @@ class MarkdownFormatter:
         """Initialize formatter with chunking strategy and size limits."""
         self.strategy = strategy
         self.chunk_size = chunk_size
+        # Token counts keyed by the exact slide text encoded, so repeated slides skip re-encoding
+        self._token_cache: Dict[str, int] = {}
         
         # Initialize token encoder if available
         if TIKTOKEN_AVAILABLE:
             try:
-                self.encoder = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
-            except:
+                self.encoder = _get_encoder("cl100k_base")  # GPT-4 encoding
+            except (LookupError, ValueError, OSError, ImportError) as e:
+                # e.g. BPE file not cached and no network; fall back to char estimate
+                logger.warning("tiktoken encoder unavailable, using rough token estimates: %s", e)
                 self.encoder = None
         else:
             self.encoder = None
@@ -70,18 +121,23 @@ class MarkdownFormatter:
         else:  # sequential
             chunks = self._chunk_sequentially(slides_data)
         
-        # Generate markdown files with chunk indexing
-        markdown_files = {}
+        # Update chunks with total count information
         total_chunks = len(chunks)
         for i, chunk in enumerate(chunks):
-            # Update chunk with total count information
             chunk.chunk_index = i + 1
             chunk.total_chunks = total_chunks
-            
-            # Create filename with proper sanitization
+        
+        # Generate markdown per chunk in parallel (chunks are independent)
+        def render(chunk: ChunkData) -> Tuple[str, str]:
             raw_filename = f"{presentation_name}_{chunk.module_id}.md"
-            filename = sanitize_filename(raw_filename)
-            content = self._generate_markdown(chunk)
+            return sanitize_filename(raw_filename), self._generate_markdown(chunk)
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(render, chunks))
+        
+        # Assemble in chunk order so output stays deterministic
+        markdown_files = {}
+        for filename, content in results:
             markdown_files[filename] = content
         
         return markdown_files
@@ -176,27 +232,20 @@ class MarkdownFormatter:
     def _chunk_sequentially(self, slides_data: List[SlideData]) -> List[ChunkData]:
         """Chunk slides sequentially based on token limits."""
         chunks = []
-        current_chunk_slides = []
         chunk_counter = 1
-        
-        for slide in slides_data:
-            current_chunk_slides.append(slide)
+        prefix = self._prefix_token_counts(slides_data)
+        start = 0
+        
+        while start < len(slides_data):
+            # Take as many slides as fit (estimate floors to <= chunk_size); a single
+            # oversized slide still gets its own chunk
+            end = bisect.bisect_left(prefix, prefix[start] + self.chunk_size + 1) - 1
+            end = max(end, start + 1)
             
-            if self._estimate_chunk_tokens(current_chunk_slides) > self.chunk_size:
-                # Remove last slide and create chunk
-                chunk_slides = current_chunk_slides[:-1]
-                if chunk_slides:  # Ensure we have content
-                    chunk = self._create_chunk(chunk_slides, f"Section {chunk_counter}", chunk_counter, len(chunks) + 1, 0)  # Will update total later
-                    chunks.append(chunk)
-                    chunk_counter += 1
-                
-                # Start new chunk with the slide that exceeded limit
-                current_chunk_slides = [slide]
-        
-        # Handle final chunk
-        if current_chunk_slides:
-            chunk = self._create_chunk(current_chunk_slides, f"Section {chunk_counter}", chunk_counter, len(chunks) + 1, 0)  # Will update total later
+            chunk = self._create_chunk(slides_data[start:end], f"Section {chunk_counter}", chunk_counter, len(chunks) + 1, 0)  # Will update total later
             chunks.append(chunk)
+            chunk_counter += 1
+            start = end
         
         return chunks
     
@@ -215,7 +264,6 @@ class MarkdownFormatter:
         assessment_items = []
         compliance_markers = []
         visual_elements_summary = []
-        slide_layout_types = []
         difficulty_levels = []
         total_estimated_time = 0
         
@@ -233,8 +281,6 @@ class MarkdownFormatter:
             for element in slide.visual_elements:
                 visual_elements_summary.append(f"{element['type']}: {element['description']}")
             
-            # Layout types
-            slide_layout_types.append(slide.slide_layout_type)
             difficulty_levels.append(slide.difficulty_level)
             total_estimated_time += slide.estimated_time
         
@@ -243,6 +289,7 @@ class MarkdownFormatter:
         prerequisites = list(dict.fromkeys(prerequisites))
         compliance_markers = list(set(compliance_markers))
         visual_elements_summary = list(dict.fromkeys(visual_elements_summary))
+        slide_layout_types = list(dict.fromkeys(slide.slide_layout_type for slide in slides))
         
         # Extract concepts with enhanced extraction
         concepts = self._extract_enhanced_concepts(slides)
@@ -285,7 +332,7 @@ class MarkdownFormatter:
             assessment_items=assessment_items,
             compliance_markers=compliance_markers,
             visual_elements_summary=visual_elements_summary,
-            slide_layout_types=list(set(slide_layout_types)),
+            slide_layout_types=slide_layout_types,
             chunk_index=chunk_index,
             total_chunks=total_chunks,
             learning_context=learning_context
@@ -293,15 +340,7 @@ class MarkdownFormatter:
     
     def _generate_module_id(self, title: str, number: int) -> str:
         """Generate a URL-friendly module ID."""
-        # Clean title and make lowercase
-        clean_title = re.sub(r'[^\w\s-]', '', title.lower())
-        clean_title = re.sub(r'[-\s]+', '-', clean_title).strip('-')
-        
-        # Limit length and add number
-        if len(clean_title) > 30:
-            clean_title = clean_title[:30].rstrip('-')
-        
-        return f"{number:02d}-{clean_title}"
+        return _module_id(title, number)
     
     def _extract_concepts(self, slides: List[SlideData]) -> List[str]:
         """Extract key concepts from slides (simplified implementation)."""
@@ -476,14 +515,8 @@ class MarkdownFormatter:
     def _estimate_chunk_tokens(self, slides: List[SlideData]) -> int:
         """Estimate token count for a chunk."""
         if self.encoder:
-            # Use tiktoken for accurate counting
-            text = ""
-            for slide in slides:
-                if slide.title:
-                    text += slide.title + " "
-                text += " ".join(slide.content) + " "
-                text += slide.speaker_notes + " "
-            return len(self.encoder.encode(text))
+            # Use tiktoken for accurate counting, summed per slide
+            return sum(self._slide_token_counts(slides))
         else:
             # Fallback: rough estimation (4 chars per token)
             total_chars = 0
@@ -494,6 +527,33 @@ class MarkdownFormatter:
                 total_chars += len(slide.speaker_notes)
             return total_chars // 4
     
+    def _slide_token_counts(self, slides: List[SlideData]) -> List[int]:
+        """Count tokens per slide, encoding every uncached slide text in one batch."""
+        texts = []
+        for slide in slides:
+            text = f"{slide.title} " if slide.title else ""
+            texts.append(f"{text}{' '.join(slide.content)} {slide.speaker_notes} ")
+        
+        missing = list(dict.fromkeys(text for text in texts if text not in self._token_cache))
+        if missing:
+            encoded = self.encoder.encode_ordinary_batch(missing, num_threads=os.cpu_count() or 1)
+            for text, tokens in zip(missing, encoded):
+                self._token_cache[text] = len(tokens)
+        
+        return [self._token_cache[text] for text in texts]
+    
+    def _prefix_token_counts(self, slides: List[SlideData]) -> List[float]:
+        """Cumulative token estimates, where entry k covers slides[:k]."""
+        if self.encoder:
+            counts = self._slide_token_counts(slides)
+        else:
+            # Quarter-token steps are exact floats, so range sums match the rough estimate's floor
+            counts = [
+                (len(slide.title or '') + sum(len(content) for content in slide.content) + len(slide.speaker_notes)) / 4
+                for slide in slides
+            ]
+        return list(itertools.accumulate(counts, initial=0))
+    
     def _find_break_point(self, slides: List[SlideData]) -> int:
         """Find optimal break point in slides list."""
         # Simple heuristic: break at activity transitions
@@ -617,7 +677,7 @@ class MarkdownFormatter:
         # Generate markdown with enhanced structure
         markdown_parts = [
             "---",
-            yaml.dump(frontmatter, default_flow_style=False, sort_keys=False).strip(),
+            yaml.dump(frontmatter, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False).strip(),
             "---",
             "",
             f"# {chunk.module_title}",
@@ -694,15 +754,7 @@ class MarkdownFormatter:
     
     def _format_duration(self, minutes: int) -> str:
         """Format duration in a human-readable way."""
-        if minutes < 60:
-            return f"{minutes} minutes"
-        else:
-            hours = minutes // 60
-            remaining_minutes = minutes % 60
-            if remaining_minutes == 0:
-                return f"{hours} hour{'s' if hours > 1 else ''}"
-            else:
-                return f"{hours} hour{'s' if hours > 1 else ''} {remaining_minutes} minutes"
+        return _format_duration(minutes)
     
     def _determine_learning_mode(self, slides: List[SlideData]) -> str:
         """Determine the primary learning mode for the chunk."""
@@ -7,19 +7,110 @@ then calls DeepSeek to infer instructional design patterns and learning structur
 
 import os
 import re
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+import json
+import struct
+import time
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterator
+from dataclasses import dataclass, fields, replace
 from pathlib import Path
 
 from pptx import Presentation
 from pptx.shapes.base import BaseShape
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger("pptx_shredder")
+
+# LLM identity and prompt version; bump PROMPT_VERSION whenever the prompt changes
+# so cached responses from the old prompt are no longer reused
+LLM_PROVIDER = "deepseek"
+LLM_MODEL = "deepseek-chat"
+PROMPT_VERSION = "v4"
+# Cached analyses older than this are re-requested
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Upper bound on concurrent DeepSeek requests and retries after rate limiting
+MAX_CONCURRENT_REQUESTS = 8
+RATE_LIMIT_RETRIES = 4
+
+# Follow-up requests allowed when the model's reply is not valid JSON
+LLM_JSON_RETRIES = 2
+
+# Output token budget per analyzed slide (JSON mode means no fences or preamble)
+MAX_TOKENS_PER_SLIDE = 250
+
+# Input budget: prefill time grows with prompt length, so clip each item we send
+# (with bullets and notes clipped too, a slide's prompt stays under ~850 chars)
+MAX_PROMPT_ITEM_CHARS = 120
+# Slides with fewer words than this (and no notes or tables) skip the LLM
+MIN_LLM_WORDS = 8
+
+STRUCTURE_SCHEMA = """{
+    "is_module_start": boolean,
+    "learning_objectives": ["specific objectives found"],
+    "prerequisites": ["prerequisites mentioned"], 
+    "activity_type": "lecture|demo|lab|assessment|overview",
+    "difficulty_level": "beginner|intermediate|advanced",
+    "estimated_time_minutes": number,
+    "content_summary": "brief summary"
+}"""
+
+# Everything static (role, schema, batch format, worked example) lives in the
+# system prompt so each request shares an identical prefix; DeepSeek caches
+# repeated prefixes automatically, and only the slide payload varies per call
+SYSTEM_PROMPT = """You are an expert in instructional design and technical training.
+Analyze training slides for learning structure.
+
+Each slide is given as Title/Text/Bullets/Notes lines. For a single slide, respond with a JSON object shaped like:
+""" + STRUCTURE_SCHEMA + """
+
+When the message holds several slides labelled "SLIDE 1:", "SLIDE 2:", ..., respond with {"slides": [...]} holding exactly one such object per slide, in order.
+
+Example slide:
+Title: Lab: Deploy a Web App
+Text: Use the Azure CLI to deploy the sample app | Verify the endpoint responds
+Bullets: az webapp up | Browse to the app URL
+Notes: Give learners about 15 minutes for this lab.
+Example response:
+{"is_module_start": false, "learning_objectives": ["Deploy a web app with the Azure CLI"], "prerequisites": ["An Azure subscription"], "activity_type": "lab", "difficulty_level": "intermediate", "estimated_time_minutes": 15, "content_summary": "Hands-on deployment of a sample web app using the Azure CLI"}
+
+Return only a JSON object, no prose."""
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dump_bytes(value: Any) -> bytes:
+    """Serialize value to UTF-8 JSON bytes, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value).encode('utf-8')
+
+
+def _clip(text: str, limit: int = MAX_PROMPT_ITEM_CHARS) -> str:
+    """Clip a single prompt item to limit characters."""
+    return text[:limit]
+
 @dataclass
 class SlideContent:
     """Structured slide content extracted from PPTX object model."""
@@ -29,8 +120,8 @@ class SlideContent:
     speaker_notes: str
     bullet_points: List[Dict[str, Any]]  # level, text
     tables: List[Dict[str, Any]]
-    images: List[Dict[str, str]]
-    charts: List[Dict[str, str]]
+    images: List[Dict[str, Any]]  # type, left, top, width, height
+    charts: List[Dict[str, Any]]  # type, left, top, width, height
     layout_name: str
     slide_size: Dict[str, int]  # width, height
 
@@ -47,14 +138,102 @@ class InstructionalStructure:
     instructional_notes: str
     content_summary: str
 
+# Field names resolved once; dataclasses.asdict recurses and deep-copies every value,
+# which is wasted work since nested values are already plain lists/dicts
+_SLIDE_CONTENT_FIELDS = tuple(f.name for f in fields(SlideContent))
+_STRUCTURE_FIELDS = tuple(f.name for f in fields(InstructionalStructure))
+
+def _to_dict(obj, field_names) -> Dict[str, Any]:
+    """Shallow dataclass-to-dict conversion over precomputed field names."""
+    return {name: getattr(obj, name) for name in field_names}
+
+class SlideLLMCache:
+    """Content-addressable on-disk cache of LLM structure inference results."""
+    
+    def __init__(self, cache_dir: str = ".cache/llm", ttl_seconds: Optional[float] = CACHE_TTL_SECONDS):
+        """Initialize cache rooted at cache_dir (created lazily on first write).
+        
+        Entries older than ttl_seconds are treated as misses; None disables expiry.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def make_key(prompt_text: str) -> str:
+        """Hash provider, model, prompt version and the slide's prompt text into a cache key.
+        
+        Keying on the (whitespace-normalized) text sent to the LLM rather than the
+        full slide lets boilerplate slides hit across positions and decks.
+        """
+        digest = hashlib.sha256()
+        parts = [
+            LLM_PROVIDER.encode(),
+            LLM_MODEL.encode(),
+            PROMPT_VERSION.encode(),
+            ' '.join(prompt_text.split()).encode(),
+        ]
+        for part in parts:
+            # Length-prefix each field so adjacent fields can't collide
+            digest.update(struct.pack('>Q', len(part)) + part)
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on miss/expired/unreadable entry."""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if self.ttl_seconds is not None and time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return _json_loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store value under key atomically (write temp file, then os.replace).
+        
+        Write failures (read-only or full disk) are logged and skipped; the cache
+        is an optimization and must not cost the caller its LLM result.
+        """
+        final_path = self.cache_dir / f"{key}.json"
+        tmp_path = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(_json_dump_bytes(value))
+            os.replace(tmp_path, final_path)
+        except OSError as e:
+            logger.warning("Could not write LLM cache entry %s: %s", final_path, e)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
 class IntelligentPPTXExtractor:
     """Extract PPTX content using object model + LLM structural inference."""
     
-    def __init__(self, pptx_path: str, use_llm: bool = True):
-        """Initialize with PPTX file and optional LLM usage."""
+    def __init__(self, pptx_path: str, use_llm: bool = True, cache_dir: Optional[str] = None,
+                 batch_size: int = 8, max_workers: int = MAX_CONCURRENT_REQUESTS,
+                 skip_hidden: bool = True, max_requests: int = MAX_CONCURRENT_REQUESTS):
+        """Initialize with PPTX file, optional LLM usage and optional response cache dir.
+        
+        max_requests caps this extractor's in-flight DeepSeek requests; callers running
+        several extractors at once split MAX_CONCURRENT_REQUESTS between them.
+        """
         self.pptx_path = Path(pptx_path)
         self.presentation = Presentation(str(self.pptx_path))
+        # Slide dimensions are deck-wide; read them from the XML once
+        self._slide_size = {
+            'width': self.presentation.slide_width,
+            'height': self.presentation.slide_height
+        }
         self.use_llm = use_llm
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.skip_hidden = skip_hidden
+        # Caps in-flight requests across worker threads (including per-slide fallbacks)
+        self._request_slots = threading.Semaphore(max(1, max_requests))
+        # In-deck memo of LLM results keyed by prompt text, for repeated template slides
+        self._mem_cache: Dict[str, InstructionalStructure] = {}
+        self.cache = SlideLLMCache(cache_dir) if cache_dir else None
+        self.slides_extracted = 0
         
         # Initialize DeepSeek client if API key available
         self.client = None
@@ -66,91 +245,129 @@ class IntelligentPPTXExtractor:
     
     def extract_all_slides(self) -> List[Dict[str, Any]]:
         """Extract content from all slides with LLM structural inference."""
-        slides = []
+        return list(self.iter_slides())
+    
+    def iter_slides(self) -> Iterator[Dict[str, Any]]:
+        """Yield each slide's content and structure as soon as it is analyzed.
         
-        for slide_num, slide in enumerate(self.presentation.slides, 1):
-            # Extract structured content using PPTX object model
-            slide_content = self._extract_slide_content(slide, slide_num)
-            
-            # Get LLM structural inference
-            if self.use_llm and self.client:
-                instructional_structure = self._infer_instructional_structure(slide_content)
-            else:
-                instructional_structure = self._fallback_structure_detection(slide_content)
-            
-            # Combine content and structure
-            slide_data = {
-                'content': asdict(slide_content),
-                'structure': asdict(instructional_structure)
-            }
-            slides.append(slide_data)
-        
-        return slides
+        Slides are extracted lazily and only a bounded number of LLM batches
+        are in flight, so memory stays proportional to the batch window rather
+        than the deck.
+        """
+        self.slides_extracted = 0
+        
+        # Extract structured content using PPTX object model; hidden slides
+        # (show="0") are skipped before any shape is touched
+        slide_contents = (
+            self._extract_slide_content(slide, slide_num)
+            for slide_num, slide in enumerate(self.presentation.slides, 1)
+            if not (self.skip_hidden and slide.element.get('show') == '0')
+        )
+        
+        if not (self.use_llm and self.client):
+            for slide_content in slide_contents:
+                yield self._combine(slide_content, self._fallback_structure_detection(slide_content))
+            return
+        
+        # Get LLM structural inference, several slides per request; requests are
+        # network-bound so batches run concurrently (the OpenAI client is thread-safe)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = deque()
+            while True:
+                batch = list(islice(slide_contents, self.batch_size))
+                if batch:
+                    in_flight.append((batch, executor.submit(self._infer_batch, batch)))
+                # Emit finished batches in slide order once the window is full
+                while in_flight and (not batch or len(in_flight) >= self.max_workers):
+                    done_batch, future = in_flight.popleft()
+                    for slide_content, structure in zip(done_batch, future.result()):
+                        yield self._combine(slide_content, structure)
+                if not batch:
+                    break
+    
+    def _combine(self, slide_content: SlideContent,
+                 instructional_structure: InstructionalStructure) -> Dict[str, Any]:
+        """Combine a slide's content and structure into the output record."""
+        self.slides_extracted += 1
+        return {
+            'content': _to_dict(slide_content, _SLIDE_CONTENT_FIELDS),
+            'structure': _to_dict(instructional_structure, _STRUCTURE_FIELDS)
+        }
     
     def _extract_slide_content(self, slide, slide_number: int) -> SlideContent:
         """Extract structured content using proper PPTX object model."""
         
-        # Extract title using slide layout
+        # Bind shape types locally for the comparisons in the loop below
+        TABLE = MSO_SHAPE_TYPE.TABLE
+        PICTURE = MSO_SHAPE_TYPE.PICTURE
+        CHART = MSO_SHAPE_TYPE.CHART
+        
+        # Extract title using slide layout (title lookup scans placeholders, so do it once)
+        shapes = list(slide.shapes)  # Materialize the lazy shape collection once
+        title_shape = slide.shapes.title if shapes else None
         title = None
-        if slide.shapes.title:
-            title = slide.shapes.title.text.strip()
+        if title_shape:
+            title = title_shape.text.strip()
         
-        # Extract all text content with structure preservation
+        # Single pass over shapes: text with structure preservation, tables, images, charts
         text_content = []
         bullet_points = []
+        tables = []
+        images = []
+        charts = []
         
-        for shape in slide.shapes:
-            if shape == slide.shapes.title:
+        for shape in shapes:
+            # Shape proxies are recreated per access, so compare by equality, not identity
+            if title_shape is not None and shape == title_shape:
                 continue
-                
-            if hasattr(shape, 'text_frame') and shape.text_frame:
+            
+            shape_type = shape.shape_type
+            if shape_type == TABLE:
+                table_data = self._extract_table_structure(shape)
+                if table_data:
+                    tables.append(table_data)
+            elif shape_type == PICTURE:
+                # Raw EMU values; formatters render them only when needed
+                images.append({
+                    'type': 'image',
+                    'left': shape.left or 0,
+                    'top': shape.top or 0,
+                    'width': shape.width or 0,
+                    'height': shape.height or 0
+                })
+            elif shape_type == CHART:
+                charts.append({
+                    'type': 'chart',
+                    'left': shape.left or 0,
+                    'top': shape.top or 0,
+                    'width': shape.width or 0,
+                    'height': shape.height or 0
+                })
+            elif hasattr(shape, 'text_frame') and shape.text_frame:
                 # Extract structured text with bullet levels
                 for paragraph in shape.text_frame.paragraphs:
                     text = paragraph.text.strip()
                     if text:
                         if paragraph.level > 0:  # Bullet point
+                            font = paragraph.font
                             bullet_points.append({
                                 'level': paragraph.level,
                                 'text': text,
-                                'font_size': getattr(paragraph.font, 'size', None),
-                                'is_bold': getattr(paragraph.font, 'bold', False)
+                                'font_size': getattr(font, 'size', None),
+                                'is_bold': getattr(font, 'bold', False)
                             })
                         else:
                             text_content.append(text)
             elif hasattr(shape, 'text') and shape.text.strip():
                 text_content.append(shape.text.strip())
         
-        # Extract tables with structure
-        tables = []
-        for shape in slide.shapes:
-            if shape.shape_type == MSO_SHAPE_TYPE.TABLE:
-                table_data = self._extract_table_structure(shape)
-                if table_data:
-                    tables.append(table_data)
-        
-        # Extract images with metadata
-        images = []
-        for shape in slide.shapes:
-            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                images.append({
-                    'type': 'image',
-                    'position': f"({getattr(shape, 'left', 0)}, {getattr(shape, 'top', 0)})",
-                    'size': f"{getattr(shape, 'width', 0)}x{getattr(shape, 'height', 0)}"
-                })
-        
-        # Extract charts
-        charts = []
-        for shape in slide.shapes:
-            if shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                charts.append({
-                    'type': 'chart',
-                    'position': f"({getattr(shape, 'left', 0)}, {getattr(shape, 'top', 0)})"
-                })
-        
         # Extract speaker notes
         speaker_notes = ""
-        if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-            speaker_notes = slide.notes_slide.notes_text_frame.text.strip()
+        has_notes = slide.has_notes_slide
+        if has_notes:
+            notes_text_frame = slide.notes_slide.notes_text_frame
+            if notes_text_frame:
+                speaker_notes = notes_text_frame.text.strip()
         
         # Get slide layout name
         layout_name = slide.slide_layout.name if hasattr(slide.slide_layout, 'name') else 'Unknown'
@@ -165,10 +382,7 @@ class IntelligentPPTXExtractor:
             images=images,
             charts=charts,
             layout_name=layout_name,
-            slide_size={
-                'width': self.presentation.slide_width,
-                'height': self.presentation.slide_height
-            }
+            slide_size=dict(self._slide_size)
         )
     
     def _extract_table_structure(self, shape) -> Optional[Dict[str, Any]]:
@@ -177,7 +391,9 @@ class IntelligentPPTXExtractor:
             return None
         
         table = shape.table
-        rows = len(table.rows)
+        # Materialize rows once; indexing table.rows re-resolves each row proxy
+        rows_list = list(table.rows)
+        rows = len(rows_list)
         cols = len(table.columns)
         
         # Extract headers (first row)
@@ -185,15 +401,12 @@ class IntelligentPPTXExtractor:
         sample_data = []
         
         try:
-            if rows > 0:
-                first_row = table.rows[0]
-                headers = [cell.text.strip() for cell in first_row.cells]
+            if rows_list:
+                headers = [cell.text.strip() for cell in rows_list[0].cells]
                 
-                # Extract a few sample rows
-                for i in range(1, min(rows, 4)):  # Max 3 sample rows
-                    row_data = [cell.text.strip() for cell in table.rows[i].cells]
-                    sample_data.append(row_data)
-        except:
+                # Extract a few sample rows (max 3)
+                sample_data = [[cell.text.strip() for cell in row.cells] for row in rows_list[1:4]]
+        except (AttributeError, IndexError):
             pass
         
         return {
@@ -202,75 +415,207 @@ class IntelligentPPTXExtractor:
             'sample_data': sample_data
         }
     
-    def _infer_instructional_structure(self, slide_content: SlideContent) -> InstructionalStructure:
-        """Use DeepSeek to infer instructional design structure."""
+    def _infer_instructional_structure(self, slide_content: SlideContent,
+                                       prompt: Optional[str] = None) -> InstructionalStructure:
+        """Use DeepSeek to infer instructional design structure.
         
-        # Prepare content for LLM analysis
-        content_summary = self._summarize_slide_for_llm(slide_content)
+        prompt is the slide's _format_slide_for_prompt text, if the caller already built it.
+        """
+        # Title-only, blank and "Questions?" slides carry no instructional signal
+        if self._is_trivial_slide(slide_content):
+            return self._fallback_structure_detection(slide_content)
         
-        # Create concise content summary
-        bullet_text = ' | '.join([bp['text'][:50] for bp in slide_content.bullet_points[:3]])
-        notes_preview = slide_content.speaker_notes[:200] if slide_content.speaker_notes else ""
+        if prompt is None:
+            prompt = self._format_slide_for_prompt(slide_content)
+        
+        # Serve from the on-disk cache when this exact slide was analyzed before
+        cache_key, cached = self._get_cached_structure(slide_content, prompt)
+        if cached is not None:
+            return cached
         
-        prompt = f"""Analyze this training slide for instructional design structure.
-
-CONTENT:
-Title: {slide_content.title}
-Text: {' | '.join(slide_content.text_content[:3])}
-Bullets: {bullet_text}
-Notes: {notes_preview}
-
-Respond with JSON only:
-{{
-    "is_module_start": boolean,
-    "learning_objectives": ["specific objectives found"],
-    "prerequisites": ["prerequisites mentioned"], 
-    "activity_type": "lecture|demo|lab|assessment|overview",
-    "difficulty_level": "beginner|intermediate|advanced",
-    "estimated_time_minutes": number,
-    "content_summary": "brief summary"
-}}"""
-
         try:
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
-                    {"role": "system", "content": "You are an expert in instructional design and technical training. Analyze slides for learning structure and provide structured JSON responses."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
+            result = self._call_llm([
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ])
+            return self._build_structure(result, slide_content, prompt, cache_key)
             
-            # Parse JSON response
-            import json
-            response_text = response.choices[0].message.content.strip()
-            print(f"DEBUG: DeepSeek response: {response_text[:200]}...")
+        except Exception as e:
+            logger.warning("LLM inference failed for slide %d: %s", slide_content.slide_number, e)
+            return self._fallback_structure_detection(slide_content)
+    
+    def _infer_batch(self, slide_contents: List[SlideContent]) -> List[InstructionalStructure]:
+        """Infer structure for several slides with a single DeepSeek request."""
+        structures: List[Optional[InstructionalStructure]] = []
+        prompts: List[Optional[str]] = []
+        cache_keys: List[Optional[str]] = []
+        for slide_content in slide_contents:
+            if self._is_trivial_slide(slide_content):
+                structures.append(self._fallback_structure_detection(slide_content))
+                prompts.append(None)
+                cache_keys.append(None)
+                continue
+            # Each slide's prompt text is built once and reused for keys and the request
+            slide_prompt = self._format_slide_for_prompt(slide_content)
+            cache_key, cached = self._get_cached_structure(slide_content, slide_prompt)
+            structures.append(cached)
+            prompts.append(slide_prompt)
+            cache_keys.append(cache_key)
+        
+        pending = [i for i, structure in enumerate(structures) if structure is None]
+        if len(pending) == 1:
+            structures[pending[0]] = self._infer_instructional_structure(slide_contents[pending[0]],
+                                                                         prompts[pending[0]])
+        elif pending:
+            # Only slide payloads go in the user message; instructions are in SYSTEM_PROMPT
+            prompt = "\n\n".join(f"SLIDE {n}:\n{prompts[i]}" for n, i in enumerate(pending, 1))
             
-            # Try to extract JSON if response has extra text
-            if response_text.startswith('```'):
-                # Remove code blocks
-                response_text = response_text.split('```')[1]
-                if response_text.startswith('json'):
-                    response_text = response_text[4:]
+            results = None
+            try:
+                results = self._call_llm(
+                    [
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=MAX_TOKENS_PER_SLIDE * len(pending)
+                ).get('slides')
+            except Exception as e:
+                logger.warning("Batched LLM inference failed for slides %s: %s",
+                               [slide_contents[i].slide_number for i in pending], e)
             
-            result = json.loads(response_text)
+            if isinstance(results, list) and len(results) == len(pending):
+                for i, result in zip(pending, results):
+                    # A null or string entry says nothing about this slide; use heuristics
+                    if isinstance(result, dict):
+                        structures[i] = self._build_structure(result, slide_contents[i], prompts[i],
+                                                              cache_keys[i])
+                    else:
+                        structures[i] = self._fallback_structure_detection(slide_contents[i])
+            else:
+                # Array length mismatch or failed call - fall back to one request per slide,
+                # issued concurrently (the shared semaphore still caps in-flight requests)
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    fallbacks = executor.map(self._infer_instructional_structure,
+                                             [slide_contents[i] for i in pending],
+                                             [prompts[i] for i in pending])
+                    for i, structure in zip(pending, fallbacks):
+                        structures[i] = structure
+        
+        return structures
+    
+    def _is_trivial_slide(self, slide_content: SlideContent) -> bool:
+        """Check whether a slide has too little content to be worth an LLM call."""
+        if slide_content.speaker_notes or slide_content.tables:
+            return False
+        total_words = len((slide_content.title or '').split())
+        total_words += sum(len(text.split()) for text in slide_content.text_content)
+        total_words += sum(len(bp['text'].split()) for bp in slide_content.bullet_points)
+        return total_words < MIN_LLM_WORDS
+    
+    def _call_llm(self, messages: List[Dict[str, str]], attempt: int = 0,
+                  max_tokens: int = MAX_TOKENS_PER_SLIDE) -> Dict[str, Any]:
+        """Request a JSON object from DeepSeek, feeding parse errors back for a retry."""
+        response = self._create_completion(
+            model=LLM_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},  # Raw JSON, no markdown fences
+            temperature=0.1,
+            max_tokens=max_tokens
+        )
+        
+        # Parse JSON response
+        response_text = response.choices[0].message.content.strip()
+        logger.debug("DeepSeek response: %s...", response_text[:200])
+        
+        try:
+            result = _json_loads(response_text)
+            if not isinstance(result, dict):
+                raise ValueError(f"expected a JSON object, got {type(result).__name__}")
+            return result
             
-            return InstructionalStructure(
-                is_module_start=result.get('is_module_start', False),
-                module_title=slide_content.title if result.get('is_module_start') else None,
-                learning_objectives=result.get('learning_objectives', []),
-                prerequisites=result.get('prerequisites', []),
-                activity_type=result.get('activity_type'),
-                difficulty_level=result.get('difficulty_level', 'beginner'),
-                estimated_time_minutes=result.get('estimated_time_minutes', 2),
-                instructional_notes='LLM analysis completed',
-                content_summary=result.get('content_summary', '')
-            )
+        except ValueError as e:  # includes json/orjson JSONDecodeError
+            if attempt >= LLM_JSON_RETRIES:
+                raise
+            logger.warning("DeepSeek returned invalid JSON (attempt %d of %d), retrying: %s",
+                           attempt + 1, LLM_JSON_RETRIES + 1, e)
             
-        except Exception as e:
-            print(f"LLM inference failed for slide {slide_content.slide_number}: {e}")
-            return self._fallback_structure_detection(slide_content)
+            # Show the model its own output and the error, then ask again
+            time.sleep(1.0 * (attempt + 1))
+            retry_messages = messages + [
+                {"role": "assistant", "content": response_text},
+                {"role": "user", "content": f"Your output had error: {e}. Fix and retry with JSON only."}
+            ]
+            return self._call_llm(retry_messages, attempt + 1, max_tokens)
+    
+    def _create_completion(self, **kwargs):
+        """Call the chat completions API, backing off exponentially on rate limits."""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                with self._request_slots:
+                    return self.client.chat.completions.create(**kwargs)
+            except RateLimitError:
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                # Sleep outside the semaphore so other workers keep making progress
+                time.sleep(2 ** attempt)
+    
+    def _get_cached_structure(self, slide_content: SlideContent, prompt_text: str):
+        """Return (cache_key, cached structure or None) for a slide and its prompt text."""
+        # Identical slides (agenda, "Questions?", breaks) send identical prompts
+        memoized = self._mem_cache.get(self._prompt_key(prompt_text))
+        cache_key = SlideLLMCache.make_key(prompt_text) if self.cache else None
+        
+        if memoized:
+            return cache_key, self._adopt_structure(memoized, slide_content)
+        
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                try:
+                    return cache_key, self._adopt_structure(InstructionalStructure(**cached), slide_content)
+                except TypeError:
+                    pass  # Schema drift - fall through to a fresh call
+        return cache_key, None
+    
+    def _adopt_structure(self, structure: InstructionalStructure,
+                         slide_content: SlideContent) -> InstructionalStructure:
+        """Copy a cached structure, taking the module title from this slide."""
+        return replace(structure, module_title=slide_content.title if structure.is_module_start else None)
+    
+    def _prompt_key(self, prompt_text: str) -> str:
+        """Key slides by the content sent to the LLM (ignores slide number, layout, etc.)."""
+        return hashlib.sha1(prompt_text.encode()).hexdigest()
+    
+    def _format_slide_for_prompt(self, slide_content: SlideContent) -> str:
+        """Render the slide fields sent to the LLM."""
+        bullet_text = ' | '.join([bp['text'][:50] for bp in slide_content.bullet_points[:3]])
+        notes_preview = slide_content.speaker_notes[:200] if slide_content.speaker_notes else ""
+        
+        return f"""Title: {_clip(slide_content.title or '')}
+Text: {' | '.join(_clip(text) for text in slide_content.text_content[:3])}
+Bullets: {bullet_text}
+Notes: {notes_preview}"""
+    
+    def _build_structure(self, result: Dict[str, Any], slide_content: SlideContent, prompt_text: str,
+                         cache_key: Optional[str] = None) -> InstructionalStructure:
+        """Build an InstructionalStructure from parsed LLM JSON and cache it under the slide's prompt text."""
+        structure = InstructionalStructure(
+            is_module_start=result.get('is_module_start', False),
+            module_title=slide_content.title if result.get('is_module_start') else None,
+            learning_objectives=result.get('learning_objectives', []),
+            prerequisites=result.get('prerequisites', []),
+            activity_type=result.get('activity_type'),
+            difficulty_level=result.get('difficulty_level', 'beginner'),
+            estimated_time_minutes=result.get('estimated_time_minutes', 2),
+            instructional_notes='LLM analysis completed',
+            content_summary=result.get('content_summary', '')
+        )
+        
+        self._mem_cache[self._prompt_key(prompt_text)] = structure
+        if self.cache and cache_key:
+            self.cache.put(cache_key, _to_dict(structure, _STRUCTURE_FIELDS))
+        
+        return replace(structure)
     
     def _fallback_structure_detection(self, slide_content: SlideContent) -> InstructionalStructure:
         """Fallback structure detection without LLM."""
@@ -5,11 +5,81 @@ This module takes the intelligent extraction results and formats them into
 high-quality markdown optimized for LLM consumption.
 """
 
-import yaml
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import io
+import re
+import json
+import shutil
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from utils import MAX_FILENAME_LENGTH, sanitize_filename, sanitize_filenames
+
+# Module ID cleanup patterns, compiled once
+_CLEAN_RE = re.compile(r'[^\w\s-]')
+_DASH_RE = re.compile(r'[-\s]+')
+
+# Chunk files are small and independent, so a few threads are enough to overlap their IO
+MAX_WRITE_THREADS = 8
+
+
+def _dedupe(items: List[Any]) -> List[Any]:
+    """Remove duplicates while preserving first-seen order."""
+    # dict.fromkeys runs in C and measured faster than a Python-level seen-set filter
+    return list(dict.fromkeys(items))
+
+
+def _write_chunk_file(path: Path, header: bytes, body_path: Path) -> None:
+    """Write one chunk's frontmatter to path, followed by the body spooled at body_path."""
+    with open(path, 'wb') as f, open(body_path, 'rb') as body:
+        f.write(header)
+        shutil.copyfileobj(body, f)
+
+
+def _escape_char(char: str) -> str:
+    """Escape one character for a YAML double-quoted scalar."""
+    code = ord(char)
+    if code <= 0xff:
+        return f"\\x{code:02x}"
+    if code <= 0xffff:
+        return f"\\u{code:04x}"
+    return f"\\U{code:08x}"
+
+
+def _yaml_scalar(value: Any) -> str:
+    """Render a scalar as YAML via JSON quoting.
+    
+    json.dumps leaves non-ASCII text readable but only escapes C0 controls;
+    YAML rejects or rewrites the rest (DEL, C1 codes, NEL, line separators),
+    so anything non-printable that is left gets an explicit escape.
+    """
+    text = json.dumps(value, ensure_ascii=False)
+    if text.isprintable():
+        return text
+    return ''.join(char if char.isprintable() else _escape_char(char) for char in text)
+
+
+def _dump_frontmatter(data: Dict[str, Any]) -> str:
+    """Serialize flat frontmatter (scalars and string lists) as YAML.
+    
+    JSON scalars are valid YAML, so json.dumps handles quoting without
+    the overhead of a full yaml.dump.
+    """
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f"- {_yaml_scalar(item)}" for item in value)
+        elif isinstance(value, (bool, int, float)):
+            lines.append(f"{key}: {json.dumps(value)}")
+        else:
+            lines.append(f"{key}: {_yaml_scalar(str(value))}")
+    return "\n".join(lines)
+
+
 @dataclass
 class IntelligentChunk:
     """Container for an intelligently formatted markdown chunk."""
@@ -19,6 +89,26 @@ class IntelligentChunk:
     content: str
     metadata: Dict[str, Any]
 
+
+def _number_chunks(chunks: Iterable[IntelligentChunk], presentation_name: str) -> List[str]:
+    """Record each chunk's position in its metadata and return its filename, in order.
+    
+    Filenames are "<presentation>_<module_id>.md". The presentation name is
+    sanitized and clipped on its own first, so a long deck name can't truncate
+    the module ids away and give every chunk the same file.
+    """
+    chunks = list(chunks)
+    for i, chunk in enumerate(chunks, 1):
+        chunk.metadata['chunk_index'] = i
+        chunk.metadata['total_chunks'] = len(chunks)
+    
+    stem = sanitize_filename(f"{presentation_name}.md")[:-len(".md")]
+    suffixes = [f"_{chunk.module_id}.md" for chunk in chunks]
+    return sanitize_filenames(
+        stem[:MAX_FILENAME_LENGTH - len(suffix)].rstrip('_') + suffix for suffix in suffixes
+    )
+
+
 class IntelligentMarkdownFormatter:
     """Format intelligent extraction results into LLM-optimized markdown."""
     
@@ -26,32 +116,68 @@ class IntelligentMarkdownFormatter:
         """Initialize formatter with target chunk size."""
         self.chunk_size = chunk_size
     
-    def format(self, slides_data: List[Dict[str, Any]], presentation_name: str) -> Dict[str, str]:
+    def format(self, slides_data: Iterable[Dict[str, Any]], presentation_name: str) -> Dict[str, str]:
         """Format intelligent slides data into markdown files."""
-        # Group slides into logical modules
-        modules = self._group_slides_into_modules(slides_data)
-        
-        # Create chunks from modules
+        return dict(self.format_iter(slides_data, presentation_name))
+    
+    def format_iter(self, slides_data: Iterable[Dict[str, Any]],
+                    presentation_name: str) -> Iterator[Tuple[str, str]]:
+        """Yield (filename, markdown) pairs one chunk at a time.
+        
+        slides_data may be a generator (e.g. IntelligentPPTXExtractor.iter_slides)
+        and only one module's slides are held at a time, but every chunk's body
+        is built before the first pair is yielded, since each frontmatter records
+        total_chunks. Only the frontmatter and headers are rendered lazily; use
+        stream_pipeline to write a deck without holding all of its bodies.
+        """
+        # Group slides into logical modules and create chunks from each as it completes
+        chunks = deque()
+        for module in self._group_slides_into_modules(slides_data):
+            chunks.extend(self._create_module_chunks(module))
+        
+        # Generate markdown files; chunk counts are needed up front for the frontmatter
+        for filename in _number_chunks(chunks, presentation_name):
+            yield filename, self._generate_markdown(chunks.popleft())
+    
+    def stream_pipeline(self, slides_data: Iterable[Dict[str, Any]], presentation_name: str,
+                        output_path: Path) -> List[str]:
+        """Format slides and write each chunk to output_path, returning the filenames.
+        
+        Each chunk's body is written to a spool file under output_path as soon
+        as its module closes, so memory is bounded by one module rather than
+        the deck. The frontmatter records the deck's chunk count, so once the
+        last module closes each output file is assembled from its header and
+        spooled body, and the spool directory is removed.
+        """
         chunks = []
-        for module in modules:
-            module_chunks = self._create_module_chunks(module)
-            chunks.extend(module_chunks)
-        
-        # Generate markdown files
-        markdown_files = {}
-        for i, chunk in enumerate(chunks):
-            chunk.metadata['chunk_index'] = i + 1
-            chunk.metadata['total_chunks'] = len(chunks)
+        with tempfile.TemporaryDirectory(prefix='.spool-', dir=output_path) as spool_dir, \
+                ThreadPoolExecutor(max_workers=MAX_WRITE_THREADS) as executor:
+            spool_path = Path(spool_dir)
+            writes = []
+            for module in self._group_slides_into_modules(slides_data):
+                for chunk in self._create_module_chunks(module):
+                    body_path = spool_path / f"{len(chunks)}.part"
+                    writes.append(executor.submit(body_path.write_bytes, chunk.content.encode('utf-8')))
+                    chunks.append(replace(chunk, content=''))
             
-            filename = f"{presentation_name}_{chunk.module_id}.md"
-            content = self._generate_markdown(chunk)
-            markdown_files[filename] = content
-        
-        return markdown_files
+            filenames = _number_chunks(chunks, presentation_name)
+            # Bodies must be on disk before they are copied into the output files
+            for write in writes:
+                write.result()
+            
+            writes = [
+                executor.submit(_write_chunk_file, output_path / filename,
+                                self._generate_header(chunk).encode('utf-8'), spool_path / f"{i}.part")
+                for i, (filename, chunk) in enumerate(zip(filenames, chunks))
+            ]
+            # Surface the first write error, if any
+            for write in writes:
+                write.result()
+        
+        return filenames
     
-    def _group_slides_into_modules(self, slides_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Group slides into logical learning modules."""
-        modules = []
+    def _group_slides_into_modules(self, slides_data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Group slides into logical learning modules, yielding each once complete."""
         current_module = {
             'module_id': '01-introduction',
             'module_title': 'Introduction',
@@ -65,7 +191,7 @@ class IntelligentMarkdownFormatter:
             # Check if this slide starts a new module
             if structure['is_module_start'] and current_module['slides']:
                 # Finalize current module
-                modules.append(current_module)
+                yield current_module
                 
                 # Start new module
                 module_counter += 1
@@ -79,9 +205,7 @@ class IntelligentMarkdownFormatter:
         
         # Add final module
         if current_module['slides']:
-            modules.append(current_module)
-        
-        return modules
+            yield current_module
     
     def _create_module_id(self, title: Optional[str]) -> str:
         """Create URL-friendly module ID from title."""
@@ -89,9 +213,7 @@ class IntelligentMarkdownFormatter:
             return "untitled"
         
         # Clean and format title
-        import re
-        clean_title = re.sub(r'[^\w\s-]', '', title.lower())
-        clean_title = re.sub(r'[-\s]+', '-', clean_title).strip('-')
+        clean_title = _DASH_RE.sub('-', _CLEAN_RE.sub('', title.lower())).strip('-')
         
         # Limit length
         if len(clean_title) > 30:
@@ -129,15 +251,17 @@ class IntelligentMarkdownFormatter:
                 total_time += structure['estimated_time_minutes']
         
         # Remove duplicates
-        all_objectives = list(dict.fromkeys(all_objectives))
-        all_prerequisites = list(dict.fromkeys(all_prerequisites))
+        all_objectives = _dedupe(all_objectives)
+        all_prerequisites = _dedupe(all_prerequisites)
         
         # Determine primary characteristics
-        primary_activity = max(set(activity_types), key=activity_types.count) if activity_types else 'lecture'
-        primary_difficulty = max(set(difficulty_levels), key=difficulty_levels.count) if difficulty_levels else 'intermediate'
+        primary_activity = Counter(activity_types).most_common(1)[0][0] if activity_types else 'lecture'
+        primary_difficulty = Counter(difficulty_levels).most_common(1)[0][0] if difficulty_levels else 'intermediate'
         
         # Generate content
-        content = self._generate_module_content(slides, module['module_title'])
+        content = self._generate_module_content(
+            slides, module['module_title'], all_objectives, all_prerequisites
+        )
         
         # Create metadata
         metadata = {
@@ -165,58 +289,61 @@ class IntelligentMarkdownFormatter:
         
         return [chunk]
     
-    def _generate_module_content(self, slides: List[Dict[str, Any]], module_title: str) -> str:
-        """Generate high-quality markdown content for a module."""
-        content_parts = []
-        
-        # Extract module-level information
-        all_objectives = []
-        all_prerequisites = []
-        
-        for slide_data in slides:
-            structure = slide_data['structure']
-            all_objectives.extend(structure.get('learning_objectives', []))
-            all_prerequisites.extend(structure.get('prerequisites', []))
+    def _generate_module_content(self, slides: List[Dict[str, Any]], module_title: str,
+                                 objectives: Optional[List[str]] = None,
+                                 prerequisites: Optional[List[str]] = None) -> str:
+        """Generate high-quality markdown content for a module.
+        
+        Callers that have already aggregated the module's objectives and
+        prerequisites pass them in to skip a second walk over the slides.
+        """
+        buf = io.StringIO()
+        
+        # Extract module-level information unless the caller already did
+        if objectives is None or prerequisites is None:
+            all_objectives = []
+            all_prerequisites = []
+            
+            for slide_data in slides:
+                structure = slide_data['structure']
+                all_objectives.extend(structure.get('learning_objectives', []))
+                all_prerequisites.extend(structure.get('prerequisites', []))
+            
+            # Remove duplicates
+            if objectives is None:
+                objectives = _dedupe(all_objectives)
+            if prerequisites is None:
+                prerequisites = _dedupe(all_prerequisites)
         
-        # Remove duplicates while preserving order
-        all_objectives = list(dict.fromkeys(all_objectives))
-        all_prerequisites = list(dict.fromkeys(all_prerequisites))
+        all_objectives = objectives
+        all_prerequisites = prerequisites
         
         # Add prerequisites section if any exist
         if all_prerequisites:
-            content_parts.extend([
-                "## 📋 Prerequisites",
-                "",
-                "Before starting this module, you should have:",
-            ])
+            buf.write("## 📋 Prerequisites\n\nBefore starting this module, you should have:\n")
             for prereq in all_prerequisites:
-                content_parts.append(f"- {prereq}")
-            content_parts.append("")
+                buf.write(f"- {prereq}\n")
+            buf.write("\n")
         
         # Add learning objectives
         if all_objectives:
-            content_parts.extend([
-                "## 🎯 Learning Objectives",
-                "",
-                "By the end of this module, you will be able to:",
-            ])
+            buf.write("## 🎯 Learning Objectives\n\nBy the end of this module, you will be able to:\n")
             for obj in all_objectives:
-                content_parts.append(f"- {obj}")
-            content_parts.append("")
+                buf.write(f"- {obj}\n")
+            buf.write("\n")
         
         # Add main content
-        content_parts.extend([
-            "## 📚 Content",
-            ""
-        ])
+        buf.write("## 📚 Content\n\n")
         
         for slide_data in slides:
-            self._add_slide_content(content_parts, slide_data)
+            self._add_slide_content(buf, slide_data)
         
-        return "\n".join(content_parts)
+        # Every section ends with a blank line; drop the final terminator so the
+        # chunk body ends right after its last separator line
+        return buf.getvalue()[:-1]
     
-    def _add_slide_content(self, content_parts: List[str], slide_data: Dict[str, Any]):
-        """Add content for a single slide."""
+    def _add_slide_content(self, buf: io.StringIO, slide_data: Dict[str, Any]):
+        """Write markdown for a single slide into buf."""
         content = slide_data['content']
         structure = slide_data['structure']
         
@@ -225,27 +352,24 @@ class IntelligentMarkdownFormatter:
         
         # Add activity type icon
         activity_icon = self._get_activity_icon(structure.get('activity_type', 'lecture'))
-        content_parts.append(f"### {activity_icon} {title}")
-        content_parts.append("")
+        buf.write(f"### {activity_icon} {title}\n\n")
         
         # Add content summary if available
         if structure.get('content_summary'):
-            content_parts.append(f"*{structure['content_summary']}*")
-            content_parts.append("")
+            buf.write(f"*{structure['content_summary']}*\n\n")
         
         # Add text content
         for text in content.get('text_content', []):
-            content_parts.append(text)
-            content_parts.append("")
+            buf.write(f"{text}\n\n")
         
         # Add bullet points
         bullet_points = content.get('bullet_points', [])
         if bullet_points:
-            content_parts.append("**Key Points:**")
+            buf.write("**Key Points:**\n")
             for bp in bullet_points:
                 indent = "  " * (bp.get('level', 1) - 1)
-                content_parts.append(f"{indent}- {bp['text']}")
-            content_parts.append("")
+                buf.write(f"{indent}- {bp['text']}\n")
+            buf.write("\n")
         
         # Add visual elements description
         images = content.get('images', [])
@@ -253,28 +377,32 @@ class IntelligentMarkdownFormatter:
         charts = content.get('charts', [])
         
         if images or tables or charts:
-            content_parts.append("**Visual Elements:**")
+            buf.write("**Visual Elements:**\n")
             for img in images:
-                content_parts.append(f"- 📷 Image at position {img.get('position', 'unknown')}")
+                buf.write(f"- 📷 Image at position {self._format_position(img)}\n")
             for table in tables:
                 dims = table.get('dimensions', 'unknown')
-                content_parts.append(f"- 📊 Table ({dims})")
+                buf.write(f"- 📊 Table ({dims})\n")
                 if table.get('headers'):
                     headers = ', '.join(table['headers'][:3])
-                    content_parts.append(f"  - Columns: {headers}...")
+                    buf.write(f"  - Columns: {headers}...\n")
             for chart in charts:
-                content_parts.append(f"- 📈 Chart at position {chart.get('position', 'unknown')}")
-            content_parts.append("")
+                buf.write(f"- 📈 Chart at position {self._format_position(chart)}\n")
+            buf.write("\n")
         
         # Add speaker notes if present
         speaker_notes = content.get('speaker_notes', '').strip()
         if speaker_notes:
-            content_parts.append("**👨‍🏫 Instructor Notes:**")
-            content_parts.append(f"> {speaker_notes[:500]}{'...' if len(speaker_notes) > 500 else ''}")
-            content_parts.append("")
+            buf.write("**👨‍🏫 Instructor Notes:**\n")
+            buf.write(f"> {speaker_notes[:500]}{'...' if len(speaker_notes) > 500 else ''}\n\n")
         
-        content_parts.append("---")
-        content_parts.append("")
+        buf.write("---\n\n")
+    
+    def _format_position(self, element: Dict[str, Any]) -> str:
+        """Render a visual element's position from its raw left/top values."""
+        if 'left' not in element or 'top' not in element:
+            return 'unknown'
+        return f"({element['left']}, {element['top']})"
     
     def _get_activity_icon(self, activity_type: str) -> str:
         """Get appropriate icon for activity type."""
@@ -305,6 +433,10 @@ class IntelligentMarkdownFormatter:
     
     def _generate_markdown(self, chunk: IntelligentChunk) -> str:
         """Generate the final markdown with YAML frontmatter."""
+        return self._generate_header(chunk) + chunk.content
+    
+    def _generate_header(self, chunk: IntelligentChunk) -> str:
+        """Generate the YAML frontmatter, title and series line that precede a chunk's content."""
         # Create comprehensive YAML frontmatter
         frontmatter = {
             'module_id': chunk.module_id,
@@ -328,24 +460,14 @@ class IntelligentMarkdownFormatter:
         # Remove empty fields
         frontmatter = {k: v for k, v in frontmatter.items() if v is not None and v != []}
         
-        # Generate markdown
-        markdown_parts = [
-            "---",
-            yaml.dump(frontmatter, default_flow_style=False, sort_keys=False).strip(),
-            "---",
-            "",
-            f"# {chunk.module_title}",
-            ""
-        ]
+        # Generate markdown into a single buffer
+        buf = io.StringIO()
+        buf.write("---\n")
+        buf.write(_dump_frontmatter(frontmatter))
+        buf.write(f"\n---\n\n# {chunk.module_title}\n\n")
         
         # Add chunk context if multiple chunks
         if chunk.metadata.get('total_chunks', 1) > 1:
-            markdown_parts.extend([
-                f"*This is part {chunk.metadata.get('chunk_index', 1)} of {chunk.metadata.get('total_chunks', 1)} in the {chunk.module_title} series.*",
-                ""
-            ])
-        
-        # Add the main content
-        markdown_parts.append(chunk.content)
+            buf.write(f"*This is part {chunk.metadata.get('chunk_index', 1)} of {chunk.metadata.get('total_chunks', 1)} in the {chunk.module_title} series.*\n\n")
         
-        return "\n".join(markdown_parts)
\ No newline at end of file
+        return buf.getvalue()
\ No newline at end of file
@@ -6,8 +6,10 @@ PPTX Shredder - Transform PowerPoint presentations into LLM-optimized markdown
 import os
 import sys
 import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import click
 from rich.console import Console
@@ -17,9 +19,9 @@ from rich.table import Table
 from rich.logging import RichHandler
 import logging
 
-from intelligent_extractor import IntelligentPPTXExtractor
+from intelligent_extractor import IntelligentPPTXExtractor, MAX_CONCURRENT_REQUESTS
 from intelligent_formatter import IntelligentMarkdownFormatter
-from utils import is_pptx_file, sanitize_filename
+from utils import is_pptx_file
 
 # Set up rich logging
 logging.basicConfig(
@@ -32,6 +34,12 @@ logger = logging.getLogger("pptx_shredder")
 
 console = Console()
 
+# Extensions picked up when scanning the input directory
+_PPTX_EXTS = frozenset({'.pptx', '.ppt'})
+
+# Rows shown in the processing plan before the rest are summarized
+MAX_PLAN_ROWS = 20
+
 @click.command()
 @click.argument('input_files', nargs=-1, type=click.Path(), required=False)
 @click.option('--input-dir', '-i', default='input', 
@@ -45,12 +53,19 @@ console = Console()
               help='Maximum tokens per chunk')
 @click.option('--config', type=click.Path(exists=True),
               help='Configuration file path')
+@click.option('--cache-dir', default='.cache/llm',
+              help='Directory for cached LLM slide analysis (default: .cache/llm/)')
+@click.option('--no-cache', is_flag=True,
+              help='Always call the LLM instead of reusing cached slide analysis')
+@click.option('--workers', '-w', default=min(os.cpu_count() or 1, 4), type=click.IntRange(min=1),
+              help='Presentations to process in parallel (default: CPU count, max 4)')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 @click.option('--dry-run', is_flag=True,
               help='Show what would be processed without actually processing')
 @click.version_option(version='0.1.0')
-def shred(input_files, input_dir, output_dir, strategy, chunk_size, config, verbose, dry_run):
+def shred(input_files, input_dir, output_dir, strategy, chunk_size, config, cache_dir, no_cache, workers, verbose,
+          dry_run):
     """Transform PowerPoint presentations into LLM-optimized markdown.
     
     🎯 Production Mode: Drop PPTX files in input/ folder, run shred.py, pick up markdown from output/
@@ -60,6 +75,7 @@ def shred(input_files, input_dir, output_dir, strategy, chunk_size, config, verb
         python src/shred.py file.pptx         # Process specific file
         python src/shred.py --dry-run          # Preview what would be processed
         python src/shred.py -v --strategy sequential --chunk-size 2000
+        python src/shred.py --workers 1        # Process files one at a time
     """
     # Set logging level
     if verbose:
@@ -93,48 +109,68 @@ def shred(input_files, input_dir, output_dir, strategy, chunk_size, config, verb
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Process files with rich progress tracking
-    _process_files(files_to_process, output_path, strategy, chunk_size, verbose)
+    if no_cache:
+        cache_dir = None
+    _process_files([path for path, _ in files_to_process], output_path, strategy, chunk_size, verbose,
+                   cache_dir, workers)
 
 
-def _discover_files(input_files: tuple, input_dir: str) -> List[Path]:
-    """Discover PPTX files to process."""
+def _discover_files(input_files: tuple, input_dir: str) -> List[Tuple[Path, int]]:
+    """Discover PPTX files to process, returning (path, size in bytes) pairs.
+    
+    Each file is stat'ed once here and the size reused by the processing plan.
+    """
     files_to_process = []
     
     if input_files:
         # Process specific files provided as arguments
         for file_path in input_files:
             path = Path(file_path)
-            if path.exists() and is_pptx_file(str(path)):
-                files_to_process.append(path)
-            elif path.exists():
-                logger.warning(f"Skipping {path} - not a PPTX file")
+            try:
+                size = path.stat().st_size
+            except OSError:
+                logger.error("File not found: %s", path)
+                continue
+            if is_pptx_file(str(path)):
+                files_to_process.append((path, size))
             else:
-                logger.error(f"File not found: {path}")
+                logger.warning("Skipping %s - not a PPTX file", path)
     else:
-        # Scan input directory for PPTX files
-        input_path = Path(input_dir)
-        if input_path.exists():
-            pptx_files = list(input_path.glob("*.pptx")) + list(input_path.glob("*.ppt"))
-            files_to_process.extend(pptx_files)
-            logger.info(f"Found {len(pptx_files)} PPTX files in {input_dir}/")
+        # Scan input directory for PPTX files in one readdir pass; scandir
+        # entries carry the stat result needed for the size column
+        try:
+            with os.scandir(input_dir) as entries:
+                pptx_files = [
+                    (Path(entry.path), entry.stat().st_size)
+                    for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in _PPTX_EXTS
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            logger.warning("Input directory %s/ does not exist", input_dir)
         else:
-            logger.warning(f"Input directory {input_dir}/ does not exist")
+            files_to_process.extend(pptx_files)
+            logger.info("Found %d PPTX files in %s/", len(pptx_files), input_dir)
     
     return sorted(files_to_process)
 
 
-def _show_processing_plan(files: List[Path], output_dir: str, strategy: str, chunk_size: int, dry_run: bool):
+def _show_processing_plan(files: List[Tuple[Path, int]], output_dir: str, strategy: str, chunk_size: int,
+                          dry_run: bool):
     """Display processing plan in a nice table."""
     table = Table(title="📋 Processing Plan", show_header=True, header_style="bold magenta")
     table.add_column("File", style="cyan", no_wrap=True)
     table.add_column("Size", justify="right", style="green")
     table.add_column("Status", justify="center")
     
-    for file_path in files:
-        size_mb = file_path.stat().st_size / (1024 * 1024)
-        status = "🔍 Preview" if dry_run else "✅ Ready"
+    status = "🔍 Preview" if dry_run else "✅ Ready"
+    for file_path, size in files[:MAX_PLAN_ROWS]:
+        size_mb = size / (1024 * 1024)
         table.add_row(file_path.name, f"{size_mb:.1f} MB", status)
     
+    # Large batches: summarize the remainder instead of rendering every row
+    if len(files) > MAX_PLAN_ROWS:
+        table.add_row("...", "", f"...and {len(files) - MAX_PLAN_ROWS} more")
+    
     console.print(table)
     
     # Show configuration
@@ -148,12 +184,73 @@ def _show_processing_plan(files: List[Path], output_dir: str, strategy: str, chu
     console.print(config_panel)
 
 
-def _process_files(files: List[Path], output_path: Path, strategy: str, chunk_size: int, verbose: bool):
-    """Process files with rich progress indicators."""
+# Heavy modules each worker needs; imported once up front rather than on first task
+_WORKER_PRELOAD = ['pptx', 'openai', 'intelligent_extractor', 'intelligent_formatter']
+
+
+def _worker_init():
+    """Import the modules listed in _WORKER_PRELOAD when a worker process starts."""
+    for module_name in _WORKER_PRELOAD:
+        __import__(module_name)
+
+
+def _worker_context():
+    """Pick the multiprocessing context for the worker pool.
+    
+    Where available, forkserver imports _WORKER_PRELOAD once in the server and
+    forks workers from it, which is cheap and avoids forking this process while
+    Rich's refresh thread is running.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return None
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(_WORKER_PRELOAD)
+    return context
+
+
+def _process_one(file_path: Path, output_path: Path, chunk_size: int, cache_dir: Optional[str] = None,
+                 max_requests: int = MAX_CONCURRENT_REQUESTS) -> Tuple[str, int, int, List[str]]:
+    """Extract, format and write one presentation.
+    
+    Module-level so it can be pickled for a worker process. max_requests is this
+    process's share of the DeepSeek concurrency limit. Returns
+    (file name, slides extracted, chunks created, written file names).
+    """
+    # Extract content using intelligent extractor
+    extractor = IntelligentPPTXExtractor(str(file_path), use_llm=True, cache_dir=cache_dir,
+                                         max_workers=max_requests, max_requests=max_requests)
+    
+    # Format to markdown using intelligent formatter, streaming slides from
+    # the extractor through module grouping straight into the output files
+    formatter = IntelligentMarkdownFormatter(chunk_size=chunk_size)
+    files_written = formatter.stream_pipeline(extractor.iter_slides(), file_path.stem, output_path)
+    
+    return file_path.name, extractor.slides_extracted, len(files_written), files_written
+
+
+def _run_inline(file_path: Path, output_path: Path, chunk_size: int,
+                cache_dir: Optional[str] = None) -> Tuple[Path, Future]:
+    """Run _process_one in this process, wrapping the outcome like a pool result."""
+    future = Future()
+    try:
+        future.set_result(_process_one(file_path, output_path, chunk_size, cache_dir, MAX_CONCURRENT_REQUESTS))
+    except Exception as e:
+        future.set_exception(e)
+    return file_path, future
+
+
+def _process_files(files: List[Path], output_path: Path, strategy: str, chunk_size: int, verbose: bool,
+                   cache_dir: Optional[str] = None, workers: int = 1):
+    """Process files with rich progress indicators.
+    
+    With more than one worker, presentations are processed in separate
+    processes; workers=1 keeps everything in-process so tracebacks stay readable.
+    """
     total_files = len(files)
     total_slides_processed = 0
     total_chunks_created = 0
     start_time = time.time()
+    workers = max(1, min(workers, total_files))
     
     with Progress(
         SpinnerColumn(),
@@ -161,56 +258,55 @@ def _process_files(files: List[Path], output_path: Path, strategy: str, chunk_si
         BarColumn(),
         TaskProgressColumn(),
         TimeElapsedColumn(),
-        console=console
+        console=console,
+        refresh_per_second=4
     ) as progress:
         
+        # One overall bar; per-file outcomes are printed as lines above it, so
+        # the live display stays a single row however many files are queued
         main_task = progress.add_task("[cyan]Processing presentations...", total=total_files)
         
-        for file_path in files:
-            file_task = progress.add_task(f"[blue]Processing {file_path.name}...", total=100)
-            
-            try:
-                # Extract content using intelligent extractor
-                progress.update(file_task, advance=20, description=f"[blue]🧠 Intelligent extraction {file_path.name}...")
-                extractor = IntelligentPPTXExtractor(str(file_path), use_llm=True)
-                slides_data = extractor.extract_all_slides()
-                total_slides_processed += len(slides_data)
-                
-                if verbose:
-                    logger.info(f"Extracted {len(slides_data)} slides from {file_path.name}")
-                
-                # Format to markdown using intelligent formatter
-                progress.update(file_task, advance=30, description=f"[blue]Formatting {file_path.name}...")
-                formatter = IntelligentMarkdownFormatter(chunk_size=chunk_size)
-                markdown_files = formatter.format(slides_data, file_path.stem)
-                total_chunks_created += len(markdown_files)
-                
-                # Write files
-                progress.update(file_task, advance=30, description=f"[blue]Writing {file_path.name}...")
-                files_written = []
-                for filename, content in markdown_files.items():
-                    output_file = output_path / filename
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    files_written.append(output_file.name)
-                
-                progress.update(file_task, advance=20, description=f"[green]✅ {file_path.name} complete")
-                
-                if verbose:
-                    logger.info(f"Created: {', '.join(files_written)}")
-                
-                # Success message
-                console.print(f"✅ {file_path.name} → {len(markdown_files)} markdown file(s)")
+        if workers == 1:
+            results = (_run_inline(file_path, output_path, chunk_size, cache_dir) for file_path in files)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context(),
+                                           initializer=_worker_init)
+            # Each process gets its own request semaphore, so split the provider's
+            # concurrency limit between them rather than giving each the full cap
+            max_requests = max(1, MAX_CONCURRENT_REQUESTS // workers)
+            futures = {
+                executor.submit(_process_one, file_path, output_path, chunk_size, cache_dir,
+                                max_requests): file_path
+                for file_path in files
+            }
+            results = ((futures[future], future) for future in as_completed(futures))
+        
+        try:
+            for file_path, future in results:
+                try:
+                    name, slide_count, chunk_count, files_written = future.result()
+                    total_slides_processed += slide_count
+                    total_chunks_created += chunk_count
+                    
+                    if verbose:
+                        logger.info("Extracted %d slides from %s", slide_count, name)
+                        logger.info("Created: %s", ', '.join(files_written))
+                    
+                    # Success message
+                    console.print(f"✅ {name} → {chunk_count} markdown file(s)")
+                    
+                except Exception as e:
+                    console.print(f"❌ {file_path.name} failed")
+                    logger.error("Error processing %s: %s", file_path.name, e)
+                    if verbose:
+                        console.print_exception()
+                    continue
                 
-            except Exception as e:
-                progress.update(file_task, description=f"[red]❌ {file_path.name} failed")
-                logger.error(f"Error processing {file_path.name}: {e}")
-                if verbose:
-                    console.print_exception()
-                continue
-            
-            finally:
-                progress.update(main_task, advance=1)
+                finally:
+                    progress.update(main_task, advance=1)
+        finally:
+            if workers > 1:
+                executor.shutdown()
     
     # Show completion summary
     elapsed_time = time.time() - start_time
@@ -5,9 +5,38 @@ Includes configuration loading, file handling, and helper functions.
 """
 
 import os
+import re
+import copy
+import functools
+import unicodedata
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Filename sanitization tables and patterns, built once
+# One translate table covers path-invalid characters plus C0/DEL/C1 control characters
+_INVALID_CHARS = frozenset('<>:"/\\|?*')
+_SANITIZE_TABLE = str.maketrans({
+    **{char: '_' for char in _INVALID_CHARS},
+    **{chr(code): '_' for code in (*range(0x00, 0x20), *range(0x7f, 0xa0))},
+})
+_COLLAPSE_RE = re.compile(r'[\s_]+')
+# Windows has a 260 char total path limit, so keep names well under it
+MAX_FILENAME_LENGTH = 150
+_WIN_RESERVED = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL',
+    *(f'COM{i}' for i in range(1, 10)),
+    *(f'LPT{i}' for i in range(1, 10)),
+})
+
+# PowerPoint extensions: common spellings for a copy-free endswith, plus a set for mixed case
+_PPTX_SUFFIXES = ('.pptx', '.ppt', '.PPTX', '.PPT')
+_PPTX_EXTS = frozenset({'.pptx', '.ppt'})
 
 
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
@@ -21,13 +50,21 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
             config_file = Path(__file__).parent.parent / 'config.yaml'
     
     if config_file.exists():
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        # Parsed once per file version; callers get their own copy to mutate
+        resolved = config_file.resolve()
+        return copy.deepcopy(_load_config_cached(str(resolved), resolved.stat().st_mtime_ns))
     else:
         # Return default configuration
         return get_default_config()
 
 
+@functools.lru_cache(maxsize=None)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file; mtime_ns is part of the key so edits are picked up."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def get_default_config() -> Dict[str, Any]:
     """Return default configuration values."""
     return {
@@ -60,31 +97,37 @@ def ensure_output_directory(output_dir: str) -> Path:
 
 def is_pptx_file(file_path: str) -> bool:
     """Check if file is a PowerPoint presentation."""
-    return Path(file_path).suffix.lower() in ['.pptx', '.ppt']
+    name = os.path.basename(file_path)
+    dot = name.rfind('.')
+    # No extension, or a bare dotfile such as ".pptx" (no stem, so not a deck)
+    if dot <= 0:
+        return False
+    return name.endswith(_PPTX_SUFFIXES) or name[dot:].lower() in _PPTX_EXTS
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for cross-platform compatibility and enterprise standards."""
-    import re
-    
     if not filename:
         return "untitled.md"
     
+    # Compose decomposed characters (e.g. 'e' + U+0301) so the same visible name
+    # always maps to the same output; the quick check makes this free for ASCII
+    if not unicodedata.is_normalized('NFC', filename):
+        filename = unicodedata.normalize('NFC', filename)
+    
     # Remove file extension temporarily to process name part
     name_part, ext = os.path.splitext(filename)
     if not ext:
         ext = ".md"  # Default extension
     
-    # Replace problematic characters for Windows, macOS, and Linux
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name_part = name_part.replace(char, '_')
-    
-    # Replace Unicode control characters and non-printable characters
-    name_part = re.sub(r'[\x00-\x1f\x7f-\x9f]', '_', name_part)
+    # Replace problematic characters for Windows, macOS, and Linux, and
+    # control characters, in a single pass. Control characters are never
+    # printable, so clean names (the common case) skip the rewrite.
+    if not (name_part.isprintable() and _INVALID_CHARS.isdisjoint(name_part)):
+        name_part = name_part.translate(_SANITIZE_TABLE)
     
     # Replace multiple spaces/underscores with single underscore
-    name_part = re.sub(r'[\s_]+', '_', name_part)
+    name_part = _COLLAPSE_RE.sub('_', name_part)
     
     # Remove leading/trailing spaces, dots, and underscores
     name_part = name_part.strip(' ._')
@@ -93,17 +136,12 @@ def sanitize_filename(filename: str) -> str:
     if name_part.startswith('.'):
         name_part = 'file' + name_part
     
-    # Check for Windows reserved names
-    windows_reserved = {
-        'CON', 'PRN', 'AUX', 'NUL',
-        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
-    if name_part.upper() in windows_reserved:
+    # Check for Windows reserved names (Windows ignores everything from the first dot)
+    if name_part.partition('.')[0].upper() in _WIN_RESERVED:
         name_part = f"file_{name_part}"
     
     # Limit length (Windows has 260 char total path limit, be conservative)
-    max_name_length = 150 - len(ext)
+    max_name_length = MAX_FILENAME_LENGTH - len(ext)
     if len(name_part) > max_name_length:
         name_part = name_part[:max_name_length].rstrip('_')
     
@@ -114,6 +152,11 @@ def sanitize_filename(filename: str) -> str:
     return name_part + ext
 
 
+def sanitize_filenames(filenames: Iterable[str]) -> List[str]:
+    """Sanitize a batch of filenames (e.g. every chunk of one deck) in one call."""
+    return list(map(sanitize_filename, filenames))
+
+
 def count_tokens_rough(text: str) -> int:
     """Rough token count estimation (4 characters per token average)."""
     return len(text) // 4
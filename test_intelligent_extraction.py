@@ -5,9 +5,16 @@ Test script for intelligent PPTX extraction using DeepSeek.
 
 import json
 import sys
+from itertools import islice
 from pathlib import Path
 from dataclasses import asdict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
@@ -31,23 +38,26 @@ def test_intelligent_extraction():
     
     # Extract first few slides for testing (start with just 2 slides)
     print("🔄 Extracting slides...")
-    slides = []
+    slide_contents = []
     
-    for slide_num, slide in enumerate(list(extractor.presentation.slides)[:5], 1):  # First 5 slides
+    for slide_num, slide in enumerate(islice(extractor.presentation.slides, 5), 1):  # First 5 slides
         print(f"   Processing slide {slide_num}...")
-        slide_content = extractor._extract_slide_content(slide, slide_num)
-        
-        print(f"   Getting LLM analysis for slide {slide_num}...")
-        if extractor.use_llm and extractor.client:
-            instructional_structure = extractor._infer_instructional_structure(slide_content)
-        else:
-            instructional_structure = extractor._fallback_structure_detection(slide_content)
-        
-        slide_data = {
+        slide_contents.append(extractor._extract_slide_content(slide, slide_num))
+    
+    # One batched LLM request for all slides (falls back to per-slide calls if the reply is malformed)
+    print(f"   Getting LLM analysis for {len(slide_contents)} slides...")
+    if extractor.use_llm and extractor.client:
+        structures = extractor._infer_batch(slide_contents)
+    else:
+        structures = [extractor._fallback_structure_detection(content) for content in slide_contents]
+    
+    slides = [
+        {
             'content': asdict(slide_content),
             'structure': asdict(instructional_structure)
         }
-        slides.append(slide_data)
+        for slide_content, instructional_structure in zip(slide_contents, structures)
+    ]
     
     print(f"✅ Extracted {len(slides)} slides")
     print()
@@ -98,8 +108,11 @@ def test_intelligent_extraction():
     
     # Save detailed results
     output_file = "intelligent_extraction_results.json"
-    with open(output_file, 'w') as f:
-        json.dump(slides, f, indent=2)
+    if ORJSON_AVAILABLE:
+        Path(output_file).write_bytes(orjson.dumps(slides, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(slides, f, indent=2)
     print(f"   Detailed results saved to: {output_file}")
 
 if __name__ == "__main__":
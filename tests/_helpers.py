@@ -0,0 +1,16 @@
+"""
+Shared helpers for test assertions.
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
+
+
+def parse_frontmatter(markdown: str) -> dict:
+    """Parse the YAML frontmatter block at the top of a generated markdown file."""
+    head = markdown.split("---\n", 2)[1]
+    return yaml.load(head, Loader=SafeLoader)
\ No newline at end of file
@@ -7,9 +7,30 @@ import tempfile
 import shutil
 from pathlib import Path
 from pptx import Presentation
+from pptx.opc.package import OpcPackage
+from pptx.opc.packuri import PackURI
 from pptx.util import Inches
 
-from src.extractor import SlideData
+from src.extractor import PPTXExtractor, SlideData
+from src.formatter import TIKTOKEN_AVAILABLE, _get_encoder
+from src.intelligent_extractor import IntelligentPPTXExtractor
+from src.intelligent_formatter import IntelligentMarkdownFormatter
+
+
+def pytest_configure(config):
+    """Register the markers used to select tests (e.g. ``-m integration``)."""
+    config.addinivalue_line("markers", "integration: Integration tests")
+    config.addinivalue_line("markers", "slow: Slow tests (may take more than a few seconds)")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _warmup():
+    """Load the tokenizer once up front so its BPE setup isn't billed to the first test."""
+    if TIKTOKEN_AVAILABLE:
+        try:
+            _get_encoder("cl100k_base").encode("warmup")
+        except (LookupError, ValueError, OSError, ImportError):
+            pass  # formatters fall back to rough token estimates
 
 
 @pytest.fixture
@@ -20,10 +41,10 @@ def temp_dir():
     shutil.rmtree(temp_path)
 
 
-@pytest.fixture
-def sample_pptx(temp_dir):
-    """Create a sample PPTX file for testing."""
-    pptx_path = temp_dir / "test_presentation.pptx"
+@pytest.fixture(scope="session")
+def sample_pptx(tmp_path_factory):
+    """Create a sample PPTX file once per test session (tests must not modify it)."""
+    pptx_path = tmp_path_factory.mktemp("sample") / "test_presentation.pptx"
     
     # Create presentation
     prs = Presentation()
@@ -68,6 +89,70 @@ def sample_pptx(temp_dir):
     return pptx_path
 
 
+def _counting_next_partname(original):
+    """Wrap OpcPackage.next_partname so each template is scanned once, then counted.
+
+    python-pptx rescans every part in the package to number each new part, which
+    makes building a large deck quadratic in its slide count.
+    """
+    counters = {}
+
+    def next_partname(package, tmpl):
+        key = (id(package), tmpl)
+        if key in counters:
+            counters[key] += 1
+        else:
+            counters[key] = original(package, tmpl).idx
+        return PackURI(tmpl % counters[key])
+
+    return next_partname
+
+
+@pytest.fixture(scope="session")
+def large_pptx(tmp_path_factory):
+    """Create a 50-slide PPTX file once per test session (tests must not modify it)."""
+    pptx_path = tmp_path_factory.mktemp("large") / "large_presentation.pptx"
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(OpcPackage, "next_partname", _counting_next_partname(OpcPackage.next_partname))
+        
+        prs = Presentation()
+        slide_layout = prs.slide_layouts[1]
+        for i in range(50):
+            slide = prs.slides.add_slide(slide_layout)
+            slide.shapes.title.text = f"Slide {i+1}: Content Title"
+            if slide.placeholders:
+                slide.placeholders[1].text = f"This is content for slide {i+1}. " * 10
+            slide.notes_slide.notes_text_frame.text = f"Speaker notes for slide {i+1}."
+        
+        prs.save(str(pptx_path))
+    return pptx_path
+
+
+@pytest.fixture(scope="session")
+def extractor(sample_pptx):
+    """Shared PPTXExtractor over the sample PPTX, for tests of its helper methods."""
+    return PPTXExtractor(str(sample_pptx))
+
+
+@pytest.fixture(scope="session")
+def extracted_slides(extractor):
+    """Slides extracted from the sample PPTX, parsed once per session."""
+    return extractor.extract()
+
+
+@pytest.fixture(scope="session")
+def intelligent_slides(sample_pptx):
+    """Slides from the intelligent extractor (heuristics only, no LLM), parsed once per session."""
+    return IntelligentPPTXExtractor(str(sample_pptx), use_llm=False).extract_all_slides()
+
+
+@pytest.fixture(scope="session")
+def pipeline_output(sample_pptx, intelligent_slides):
+    """In-memory {filename: markdown} from the same extractor and formatter shred uses."""
+    return IntelligentMarkdownFormatter().format(intelligent_slides, sample_pptx.stem)
+
+
 @pytest.fixture
 def sample_slide_data():
     """Create sample SlideData objects for testing."""
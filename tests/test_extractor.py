@@ -8,6 +8,50 @@ from pathlib import Path
 from src.extractor import PPTXExtractor, SlideData
 
 
+# Title-based module start detection
+MODULE_START_CASES = [
+    ("Module 1: Introduction", True),
+    ("Section 2: Advanced Topics", True), 
+    ("Chapter 3: Best Practices", True),
+    ("Unit 4: Assessment", True),
+    ("Lesson 5: Summary", True),
+    ("Regular Slide Title", False),
+    ("Lab: Hands-on Exercise", False),  # Lab is activity, not module
+]
+
+# Title-based activity type detection
+ACTIVITY_TYPE_CASES = [
+    ("Lab: Create Account", "lab"),
+    ("Exercise 1: Practice", "exercise"),
+    ("Demo: How to Configure", "demo"),
+    ("Assessment: Quiz", "assessment"),
+    ("Try it: Hands-on", "hands-on"),
+    ("Review Questions", "review"),
+    ("Regular Content Slide", None),
+]
+
+# Keyword-based programming language detection
+LANGUAGE_CASES = [
+    ("def hello():\n    print('world')", "python"),
+    ("function test() {\n    console.log('hello');\n}", "javascript"),
+    ("SELECT * FROM users WHERE id = 1", "sql"),
+    ("public class Test {\n    public static void main() {}\n}", "java"),
+    ("<div>Hello World</div>", "html"),
+    ("using System;\nnamespace Test {}", "csharp"),
+    ("Some regular text", "text"),
+]
+
+# (helper name, positional args, expected result) for the pure classification helpers
+HELPER_CASES = (
+    [pytest.param("_is_module_start", (title, []), expected, id=f"module_start-{title}")
+     for title, expected in MODULE_START_CASES]
+    + [pytest.param("_detect_activity_type", (title, []), expected, id=f"activity_type-{title}")
+       for title, expected in ACTIVITY_TYPE_CASES]
+    + [pytest.param("_detect_language", (code,), expected, id=f"language-{expected}")
+       for code, expected in LANGUAGE_CASES]
+)
+
+
 class TestPPTXExtractor:
     """Test the PPTXExtractor class."""
     
@@ -23,10 +67,9 @@ class TestPPTXExtractor:
         with pytest.raises(Exception):
             PPTXExtractor(str(invalid_path))
     
-    def test_extract_basic_content(self, sample_pptx):
+    def test_extract_basic_content(self, extracted_slides):
         """Test basic content extraction from PPTX."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        slides_data = extractor.extract()
+        slides_data = extracted_slides
         
         assert len(slides_data) == 3
         assert all(isinstance(slide, SlideData) for slide in slides_data)
@@ -38,40 +81,36 @@ class TestPPTXExtractor:
         assert first_slide.is_module_start is True
         assert len(first_slide.learning_objectives) > 0
     
-    def test_extract_slide_titles(self, sample_pptx):
+    def test_extract_slide_titles(self, extracted_slides):
         """Test extraction of slide titles."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        slides_data = extractor.extract()
+        slides_data = extracted_slides
         
         titles = [slide.title for slide in slides_data]
         assert "Module 1: Azure Fundamentals" in titles[0]
         assert "What is Cloud Computing?" in titles[1]
         assert "Lab: Create Azure Account" in titles[2]
     
-    def test_extract_speaker_notes(self, sample_pptx):
+    def test_extract_speaker_notes(self, extracted_slides):
         """Test extraction of speaker notes."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        slides_data = extractor.extract()
+        slides_data = extracted_slides
         
         # Check that speaker notes are extracted
         notes = [slide.speaker_notes for slide in slides_data]
         assert any("Learning objective" in note for note in notes)
         assert any("15 minutes" in note for note in notes)
     
-    def test_module_detection(self, sample_pptx):
+    def test_module_detection(self, extracted_slides):
         """Test detection of module start slides."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        slides_data = extractor.extract()
+        slides_data = extracted_slides
         
         # First slide should be detected as module start
         assert slides_data[0].is_module_start is True
         assert slides_data[1].is_module_start is False
         assert slides_data[2].is_module_start is False
     
-    def test_activity_detection(self, sample_pptx):
+    def test_activity_detection(self, extracted_slides):
         """Test detection of activity types."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        slides_data = extractor.extract()
+        slides_data = extracted_slides
         
         # Lab slide should be detected
         lab_slide = slides_data[2]
@@ -81,40 +120,8 @@ class TestPPTXExtractor:
         assert slides_data[0].activity_type is None
         assert slides_data[1].activity_type is None
     
-    @pytest.mark.parametrize("title,expected", [
-        ("Module 1: Introduction", True),
-        ("Section 2: Advanced Topics", True), 
-        ("Chapter 3: Best Practices", True),
-        ("Unit 4: Assessment", True),
-        ("Lesson 5: Summary", True),
-        ("Regular Slide Title", False),
-        ("Lab: Hands-on Exercise", False),  # Lab is activity, not module
-    ])
-    def test_is_module_start_detection(self, sample_pptx, title, expected):
-        """Test module start detection with various titles."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        result = extractor._is_module_start(title, [])
-        assert result == expected
-    
-    @pytest.mark.parametrize("title,expected_activity", [
-        ("Lab: Create Account", "lab"),
-        ("Exercise 1: Practice", "exercise"),
-        ("Demo: How to Configure", "demo"),
-        ("Assessment: Quiz", "assessment"),
-        ("Try it: Hands-on", "hands-on"),
-        ("Review Questions", "review"),
-        ("Regular Content Slide", None),
-    ])
-    def test_activity_type_detection(self, sample_pptx, title, expected_activity):
-        """Test activity type detection with various titles."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        result = extractor._detect_activity_type(title, [])
-        assert result == expected_activity
-    
-    def test_learning_objectives_extraction(self, sample_pptx):
+    def test_learning_objectives_extraction(self, extractor):
         """Test extraction of learning objectives from text."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        
         content = ["By the end of this module, you will understand cloud basics"]
         notes = "Objective: Students will be able to explain cloud computing."
         
@@ -122,10 +129,8 @@ class TestPPTXExtractor:
         assert len(objectives) > 0
         assert any("cloud" in obj.lower() for obj in objectives)
     
-    def test_code_detection(self, sample_pptx):
+    def test_code_detection(self, extractor):
         """Test detection of code blocks in content."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        
         # Mock shape for testing
         class MockShape:
             def __init__(self, text):
@@ -139,17 +144,8 @@ class TestPPTXExtractor:
         regular_text = "This is just regular presentation text"
         assert extractor._looks_like_code(regular_text, MockShape(regular_text)) is False
     
-    @pytest.mark.parametrize("code,expected_language", [
-        ("def hello():\n    print('world')", "python"),
-        ("function test() {\n    console.log('hello');\n}", "javascript"),
-        ("SELECT * FROM users WHERE id = 1", "sql"),
-        ("public class Test {\n    public static void main() {}\n}", "java"),
-        ("<div>Hello World</div>", "html"),
-        ("using System;\nnamespace Test {}", "csharp"),
-        ("Some regular text", "text"),
-    ])
-    def test_language_detection(self, sample_pptx, code, expected_language):
-        """Test programming language detection."""
-        extractor = PPTXExtractor(str(sample_pptx))
-        result = extractor._detect_language(code)
-        assert result == expected_language
\ No newline at end of file
+    @pytest.mark.parametrize("helper_name,args,expected", HELPER_CASES)
+    def test_classification_helpers(self, helper_name, args, expected):
+        """Test module start, activity type and language detection on raw inputs."""
+        result = getattr(PPTXExtractor, helper_name)(*args)
+        assert result == expected
\ No newline at end of file
@@ -3,11 +3,11 @@ Unit tests for the MarkdownFormatter module.
 """
 
 import pytest
-import yaml
 from pathlib import Path
 
 from src.formatter import MarkdownFormatter, ChunkData
 from src.extractor import SlideData
+from tests._helpers import parse_frontmatter
 
 
 class TestMarkdownFormatter:
@@ -165,7 +165,7 @@ class TestMarkdownFormatter:
         assert len(parts) >= 3
         
         # Parse frontmatter
-        frontmatter = yaml.safe_load(parts[1])
+        frontmatter = parse_frontmatter(markdown)
         assert frontmatter['module_id'] == chunk.module_id
         assert frontmatter['module_title'] == chunk.module_title
         assert frontmatter['slide_range'] == list(chunk.slide_range)
@@ -185,8 +185,7 @@ class TestMarkdownFormatter:
         markdown = formatter._generate_markdown(chunk)
         
         # Parse frontmatter to check activity type
-        parts = markdown.split("---\n", 2)
-        frontmatter = yaml.safe_load(parts[1])
+        frontmatter = parse_frontmatter(markdown)
         assert frontmatter.get('activity_type') == 'lab'
     
     @pytest.mark.parametrize("strategy", ['instructional', 'sequential', 'module-based'])
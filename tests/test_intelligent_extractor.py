@@ -0,0 +1,216 @@
+"""
+Unit tests for the IntelligentPPTXExtractor module (LLM calls use a fake client).
+"""
+
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.intelligent_extractor import IntelligentPPTXExtractor, SlideContent, SlideLLMCache
+
+
+LLM_STRUCTURE = {
+    "is_module_start": False,
+    "learning_objectives": ["Explain cloud computing"],
+    "prerequisites": [],
+    "activity_type": "lecture",
+    "difficulty_level": "beginner",
+    "estimated_time_minutes": 5,
+    "content_summary": "Cloud computing overview",
+}
+
+
+class FakeCompletions:
+    """Stand-in for client.chat.completions that replays canned replies."""
+
+    def __init__(self, reply):
+        """reply maps the request kwargs to the response text."""
+        self.reply = reply
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        """Record the request and return a response shaped like the OpenAI client's."""
+        with self._lock:
+            self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.reply(kwargs))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _slide(number, title="Cloud Computing Service Models Explained",
+           text=("Infrastructure, platform and software as a service",), notes="Cover each model."):
+    """Build a SlideContent with enough words to be sent to the LLM."""
+    return SlideContent(
+        slide_number=number,
+        title=title,
+        text_content=list(text),
+        speaker_notes=notes,
+        bullet_points=[],
+        tables=[],
+        images=[],
+        charts=[],
+        layout_name="Title and Content",
+        slide_size={"width": 0, "height": 0},
+    )
+
+
+@pytest.fixture
+def make_extractor(sample_pptx, monkeypatch):
+    """Build an LLM-enabled extractor whose client replays the given reply function."""
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+
+    def make(reply, **kwargs):
+        extractor = IntelligentPPTXExtractor(str(sample_pptx), **kwargs)
+        completions = FakeCompletions(reply)
+        extractor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return extractor, completions
+
+    return make
+
+
+class TestSlideLLMCache:
+    """Test the on-disk LLM response cache."""
+
+    def test_put_then_get(self, temp_dir):
+        """Stored entries round-trip; unknown keys miss."""
+        cache = SlideLLMCache(str(temp_dir / "llm"))
+        key = SlideLLMCache.make_key("Title: Cloud")
+
+        assert cache.get(key) is None
+        cache.put(key, LLM_STRUCTURE)
+        assert cache.get(key) == LLM_STRUCTURE
+        assert cache.get(SlideLLMCache.make_key("Title: Storage")) is None
+
+    def test_key_ignores_whitespace_differences(self):
+        """Prompts differing only in whitespace share a key."""
+        assert SlideLLMCache.make_key("Title:  Cloud\n") == SlideLLMCache.make_key("Title: Cloud")
+
+    def test_expired_entries_miss(self, temp_dir):
+        """Entries older than the TTL are treated as misses."""
+        cache = SlideLLMCache(str(temp_dir), ttl_seconds=60)
+        key = SlideLLMCache.make_key("Title: Cloud")
+        cache.put(key, LLM_STRUCTURE)
+
+        stale = time.time() - 120
+        os.utime(temp_dir / f"{key}.json", (stale, stale))
+        assert cache.get(key) is None
+        assert SlideLLMCache(str(temp_dir), ttl_seconds=None).get(key) == LLM_STRUCTURE
+
+    def test_unwritable_cache_dir_is_skipped(self, temp_dir):
+        """A cache dir that cannot be created logs a warning instead of raising."""
+        blocker = temp_dir / "not_a_dir"
+        blocker.write_text("")
+        cache = SlideLLMCache(str(blocker / "llm"))
+        key = SlideLLMCache.make_key("Title: Cloud")
+
+        cache.put(key, LLM_STRUCTURE)
+        assert cache.get(key) is None
+
+    def test_schema_drift_triggers_fresh_call(self, make_extractor, temp_dir):
+        """Cached entries that no longer fit InstructionalStructure are re-requested."""
+        extractor, completions = make_extractor(lambda kwargs: json.dumps(LLM_STRUCTURE),
+                                                cache_dir=str(temp_dir))
+        slide = _slide(1)
+        key = SlideLLMCache.make_key(extractor._format_slide_for_prompt(slide))
+        extractor.cache.put(key, {"is_module_start": False, "removed_field": "x"})
+
+        structure = extractor._infer_batch([slide])[0]
+
+        assert len(completions.calls) == 1
+        assert structure.content_summary == LLM_STRUCTURE["content_summary"]
+        assert extractor.cache.get(key)["content_summary"] == LLM_STRUCTURE["content_summary"]
+
+
+class TestStructureInference:
+    """Test LLM structure inference against a fake client."""
+
+    def test_non_dict_entries_use_fallback(self, make_extractor):
+        """Null or string entries in the slides array fall back to heuristics for that slide."""
+        reply = json.dumps({"slides": [LLM_STRUCTURE, None, "lecture"]})
+        extractor, completions = make_extractor(lambda kwargs: reply)
+
+        structures = extractor._infer_batch([_slide(1), _slide(2, title="Module 2: Storage Overview"), _slide(3)])
+
+        assert len(completions.calls) == 1
+        assert structures[0].instructional_notes == 'LLM analysis completed'
+        assert structures[1].instructional_notes == 'Fallback detection used'
+        assert structures[1].is_module_start is True
+        assert structures[2].instructional_notes == 'Fallback detection used'
+
+    def test_trivial_slides_skip_the_llm(self, make_extractor):
+        """Slides with too few words use heuristics and are left out of the request."""
+        extractor, completions = make_extractor(lambda kwargs: json.dumps(LLM_STRUCTURE))
+
+        structures = extractor._infer_batch([_slide(1, title="Questions?", text=(), notes=""), _slide(2)])
+
+        assert len(completions.calls) == 1
+        assert "Questions?" not in completions.calls[0]["messages"][-1]["content"]
+        assert structures[0].instructional_notes == 'Fallback detection used'
+        assert structures[1].instructional_notes == 'LLM analysis completed'
+
+    def test_malformed_json_is_retried_with_feedback(self, make_extractor, monkeypatch):
+        """An unparseable reply is sent back with the error, and the corrected reply is used."""
+        monkeypatch.setattr("src.intelligent_extractor.time.sleep", lambda seconds: None)
+        replies = iter(['{"is_module_start": false, "learning_objectives": [', json.dumps(LLM_STRUCTURE)])
+        extractor, completions = make_extractor(lambda kwargs: next(replies))
+
+        structure = extractor._infer_instructional_structure(_slide(1))
+
+        assert len(completions.calls) == 2
+        retry_messages = completions.calls[1]["messages"]
+        assert retry_messages[-2]["role"] == "assistant"
+        assert retry_messages[-1]["content"].startswith("Your output had error:")
+        assert structure.instructional_notes == 'LLM analysis completed'
+        assert structure.content_summary == LLM_STRUCTURE["content_summary"]
+
+    def test_out_of_order_completion_keeps_slide_order(self, make_extractor):
+        """Slides are yielded in deck order even when later batches finish first."""
+        last_slide_done = threading.Event()
+        finished = []
+
+        def reply(kwargs):
+            prompt = kwargs["messages"][-1]["content"]
+            title = prompt.splitlines()[0][len("Title: "):]
+            if title.startswith("Module 1"):
+                # Hold the first slide's reply until the last slide has been answered
+                last_slide_done.wait(timeout=5)
+            finished.append(title)
+            if title.startswith("Lab"):
+                last_slide_done.set()
+            return json.dumps(dict(LLM_STRUCTURE, content_summary=title))
+
+        extractor, _ = make_extractor(reply, batch_size=1, max_workers=3)
+
+        slides = extractor.extract_all_slides()
+
+        assert finished[-1].startswith("Module 1")
+        assert [slide['content']['slide_number'] for slide in slides] == [1, 2, 3]
+        assert [slide['structure']['content_summary'] for slide in slides] == [
+            slide['content']['title'] for slide in slides
+        ]
+
+    def test_max_requests_caps_in_flight_calls(self, make_extractor):
+        """No more than max_requests calls run at once, however many batches are in flight."""
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def reply(kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return json.dumps(LLM_STRUCTURE)
+
+        extractor, completions = make_extractor(reply, batch_size=1, max_workers=3, max_requests=1)
+
+        extractor.extract_all_slides()
+
+        assert len(completions.calls) == 3
+        assert peak[0] == 1
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Unit tests for the IntelligentMarkdownFormatter module.
+"""
+
+import pytest
+import yaml
+from dataclasses import asdict
+
+from src.intelligent_extractor import InstructionalStructure, SlideContent
+from src.intelligent_formatter import (IntelligentChunk, IntelligentMarkdownFormatter, _dump_frontmatter,
+                                       _number_chunks)
+
+
+def _slide_record(number, title, is_module_start=False):
+    """Build one slide record shaped like IntelligentPPTXExtractor.iter_slides output."""
+    content = SlideContent(
+        slide_number=number,
+        title=title,
+        text_content=[f"Key point for {title}", "Caf\u00e9 \U0001f680 example"],
+        speaker_notes=f"Walk through {title}.",
+        bullet_points=[{'level': 1, 'text': 'Supporting detail', 'font_size': None, 'is_bold': False}],
+        tables=[],
+        images=[],
+        charts=[],
+        layout_name="Title and Content",
+        slide_size={'width': 0, 'height': 0},
+    )
+    structure = InstructionalStructure(
+        is_module_start=is_module_start,
+        module_title=title if is_module_start else None,
+        learning_objectives=[f"Understand {title}"],
+        prerequisites=[],
+        activity_type='lecture',
+        difficulty_level='beginner',
+        estimated_time_minutes=3,
+        instructional_notes='Fallback detection used',
+        content_summary=f"Summary of {title}",
+    )
+    return {'content': asdict(content), 'structure': asdict(structure)}
+
+
+# Two modules of two slides each, after an untitled opening slide
+SLIDE_RECORDS = [
+    _slide_record(1, "Welcome"),
+    _slide_record(2, "Module 1: Storage Accounts", is_module_start=True),
+    _slide_record(3, "Blob Storage"),
+    _slide_record(4, "Module 2: Networking", is_module_start=True),
+    _slide_record(5, "Virtual Networks"),
+]
+
+
+def _intelligent_chunks(*module_ids):
+    """Build empty IntelligentChunks with the given module ids."""
+    return [IntelligentChunk(module_id=module_id, module_title=module_id, slide_range=(1, 1),
+                             content='', metadata={})
+            for module_id in module_ids]
+
+
+class TestIntelligentChunkNumbering:
+    """Test chunk numbering and filename construction for the intelligent formatter."""
+    
+    def test_chunk_positions_recorded(self):
+        """Each chunk's metadata records its 1-based index and the chunk count."""
+        chunks = _intelligent_chunks("01-introduction", "02-storage-accounts")
+        _number_chunks(chunks, "deck")
+        
+        assert [chunk.metadata for chunk in chunks] == [
+            {'chunk_index': 1, 'total_chunks': 2},
+            {'chunk_index': 2, 'total_chunks': 2},
+        ]
+    
+    def test_long_presentation_name_keeps_module_ids(self):
+        """A deck name longer than the filename limit is clipped before the module id is appended."""
+        filenames = _number_chunks(_intelligent_chunks("01-introduction", "02-storage-accounts"),
+                                   "Quarterly Training " * 20)
+        
+        assert len(set(filenames)) == 2
+        assert filenames[0].endswith("_01-introduction.md")
+        assert filenames[1].endswith("_02-storage-accounts.md")
+        assert all(len(name) <= 150 for name in filenames)
+    
+    def test_presentation_name_is_sanitized(self):
+        """Unsafe characters in the deck name are replaced."""
+        assert _number_chunks(_intelligent_chunks("01-introduction"), "Q1: Azure/AWS") == ["Q1_Azure_AWS_01-introduction.md"]
+
+
+class TestIntelligentFrontmatter:
+    """Test the intelligent formatter's YAML frontmatter serializer."""
+    
+    @pytest.mark.parametrize("text", [
+        "Azure Fundamentals",
+        "Caf\u00e9 \U0001f680 \u4e91",
+        'Quotes " and \\ backslashes',
+        "Tabs\tand\nnewlines",
+        "C1 \x80 control",
+        "Next line \x85 and DEL \x7f",
+        "Line \u2028 separator and BOM \ufeff",
+    ])
+    def test_round_trip(self, text):
+        """Dumped frontmatter loads back to the same values."""
+        data = {
+            'module_title': text,
+            'learning_objectives': [text, "Explain storage"],
+            'slide_range': [1, 3],
+            'has_speaker_notes': True,
+        }
+        assert yaml.safe_load(_dump_frontmatter(data)) == data
+
+
+class TestStreamPipeline:
+    """Test stream_pipeline, the path the CLI uses to write chunk files."""
+    
+    def test_matches_format(self, temp_dir):
+        """Files written by stream_pipeline have the same names and bytes as format()."""
+        expected = IntelligentMarkdownFormatter().format(SLIDE_RECORDS, "Azure Training")
+        
+        filenames = IntelligentMarkdownFormatter().stream_pipeline(iter(SLIDE_RECORDS), "Azure Training", temp_dir)
+        
+        assert len(expected) > 1
+        assert filenames == list(expected)
+        assert sorted(path.name for path in temp_dir.iterdir()) == sorted(expected)  # spool removed
+        for filename, markdown in expected.items():
+            assert (temp_dir / filename).read_bytes() == markdown.encode('utf-8')
+    
+    def test_long_presentation_name_writes_distinct_files(self, temp_dir):
+        """A 200-character deck name still gives every chunk its own file."""
+        chunk_count = len(IntelligentMarkdownFormatter().format(SLIDE_RECORDS, "deck"))
+        
+        filenames = IntelligentMarkdownFormatter().stream_pipeline(iter(SLIDE_RECORDS), "d" * 200, temp_dir)
+        
+        assert len(filenames) == chunk_count > 1
+        assert len(set(filenames)) == chunk_count
+        assert len(list(temp_dir.glob("*.md"))) == chunk_count
+        assert all(len(name) <= 150 for name in filenames)
\ No newline at end of file
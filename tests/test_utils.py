@@ -3,7 +3,24 @@ Tests for utility functions.
 """
 
 import pytest
-from src.utils import sanitize_filename, is_pptx_file, load_config
+from src.utils import sanitize_filename, sanitize_filenames, is_pptx_file, load_config, get_default_config
+
+
+# Characters that must never appear in a sanitized filename
+_UNSAFE = frozenset('<>:"/\\|?*')
+
+ENTERPRISE_FILENAMES = [
+    ("Azure Training Module 1: Introduction.md", "Azure_Training_Module_1_Introduction.md"),
+    ("AWS Solutions Architect (Advanced).md", "AWS_Solutions_Architect_(Advanced).md"),
+    ("Data Science & ML Fundamentals.md", "Data_Science_&_ML_Fundamentals.md"),
+    ("Microsoft 365 - Admin Guide.md", "Microsoft_365_-_Admin_Guide.md"),
+]
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Default configuration, built once per session (tests must not modify it)."""
+    return get_default_config()
 
 
 class TestFilenameSanitization:
@@ -31,6 +48,9 @@ class TestFilenameSanitization:
         
         result = sanitize_filename("com1.md")
         assert result == "file_com1.md"
+        
+        result = sanitize_filename("NUL.backup.md")
+        assert result == "file_NUL.backup.md"
     
     def test_sanitize_long_filename(self):
         """Test long filename truncation."""
@@ -62,42 +82,54 @@ class TestFilenameSanitization:
         result = sanitize_filename("file\x00\x01\x1f.md")
         assert result == "file___.md"
     
-    def test_sanitize_enterprise_examples(self):
+    def test_sanitize_unicode_normalization(self):
+        """Test decomposed and precomposed characters produce the same name."""
+        assert sanitize_filename("cafe\u0301.md") == sanitize_filename("caf\u00e9.md") == "caf\u00e9.md"
+    
+    @pytest.mark.parametrize("input_name,expected", ENTERPRISE_FILENAMES)
+    def test_sanitize_enterprise_examples(self, input_name, expected):
         """Test real-world enterprise filename examples."""
-        test_cases = [
-            ("Azure Training Module 1: Introduction.md", "Azure_Training_Module_1_Introduction.md"),
-            ("AWS Solutions Architect (Advanced).md", "AWS_Solutions_Architect_(Advanced).md"),
-            ("Data Science & ML Fundamentals.md", "Data_Science_&_ML_Fundamentals.md"),
-            ("Microsoft 365 - Admin Guide.md", "Microsoft_365_-_Admin_Guide.md"),
-        ]
-        
-        for input_name, expected in test_cases:
-            result = sanitize_filename(input_name)
-            # Should be safe for filesystem
-            assert not any(char in result for char in '<>:"/\\|?*')
-            assert len(result) <= 154
+        result = sanitize_filename(input_name)
+        assert result == expected
+        # Should be safe for filesystem
+        assert _UNSAFE.isdisjoint(result)
+        assert len(result) <= 154
+    
+    def test_sanitize_filenames_batch(self):
+        """Test batch sanitization matches sanitizing each name on its own."""
+        names = [name for name, _ in ENTERPRISE_FILENAMES] + ["CON.md", "", "file\x00.md"]
+        assert sanitize_filenames(names) == [sanitize_filename(name) for name in names]
 
 
 class TestFileValidation:
     """Test file validation functions."""
     
-    def test_is_pptx_file(self):
+    @pytest.mark.parametrize("file_path,expected", [
+        ("presentation.pptx", True),
+        ("presentation.ppt", True),
+        ("PRESENTATION.PPTX", True),
+        ("deck.PpTx", True),
+        ("DECK.PPTX", True),
+        ("deck.Ppt", True),
+        ("deck.PpTx.docx", False),
+        (".pptx", False),
+        ("slides/.ppt", False),
+        ("slides/deck.pptx", True),
+        ("document.docx", False),
+        ("image.jpg", False),
+        ("presentation", False),
+    ])
+    def test_is_pptx_file(self, file_path, expected):
         """Test PPTX file detection."""
-        assert is_pptx_file("presentation.pptx") is True
-        assert is_pptx_file("presentation.ppt") is True
-        assert is_pptx_file("PRESENTATION.PPTX") is True
-        assert is_pptx_file("document.docx") is False
-        assert is_pptx_file("image.jpg") is False
-        assert is_pptx_file("presentation") is False
+        assert is_pptx_file(file_path) is expected
 
 
 class TestConfiguration:
     """Test configuration loading."""
     
-    def test_get_default_config(self):
+    def test_get_default_config(self, default_config):
         """Test default configuration structure."""
-        from src.utils import get_default_config
-        config = get_default_config()
+        config = default_config
         
         assert 'chunking' in config
         assert 'content' in config